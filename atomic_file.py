@@ -0,0 +1,21 @@
+from typing import Optional, Union
+import os
+
+
+def write_atomic(content: Union[str, bytes], path: str, backup: Optional[str] = None) -> None:
+    """Replace path with content through a synced temp file, so a crash leaves the old or the new file
+
+    bytes content is written in binary mode. If backup is given, the old file is moved there
+    just before the replace.
+    """
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb' if isinstance(content, bytes) else 'w') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    if backup:
+        try:
+            os.replace(path, backup)
+        except FileNotFoundError:
+            pass
+    os.replace(temp_path, path)
@@ -0,0 +1,152 @@
+from typing import List, Optional, Tuple
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from http_client import client  # noqa: E402
+from price_engine import PriceEngine, PriceSnapshot  # noqa: E402
+from providers import BinanceSource, FxSource, FxRateCache  # noqa: E402
+from portfolio import Portfolio  # noqa: E402
+from mock_binance import mock_symbols  # noqa: E402
+
+# Constants
+DEFAULT_SIZES = [1, 10, 100, 1000]
+DEFAULT_TICKS = 50
+LOTS_PER_SYMBOL = 20  # Buys and sells per held symbol
+MOCK_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mock_binance.py')
+
+
+def percentile(values: List[float], share: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(share * len(ordered))) - 1))]
+
+
+def free_port() -> int:
+    """Return an unused local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_mock(args) -> Tuple[subprocess.Popen, str]:
+    """Run the mock server in its own process so its CPU time is not counted"""
+    port = free_port()
+    process = subprocess.Popen([
+        sys.executable, MOCK_SCRIPT, '--port', str(port), '--symbols', str(max(args.sizes) * 2),
+        '--latency', str(args.latency), '--jitter', str(args.jitter),
+        '--error-rate', str(args.error_rate), '--rate-limit-rate', str(args.rate_limit_rate)
+    ], stdout=subprocess.PIPE)
+    process.stdout.readline()  # Wait for the ready line
+    return process, f'http://127.0.0.1:{port}'
+
+
+def request_count(base: str) -> int:
+    """Return requests served so far by the mock"""
+    return client.get_json(f'{base}/__stats')['requests']
+
+
+class TableBench:
+    """Measures the cost of pushing snapshots into the price board (needs PyQt5)"""
+
+    def __init__(self) -> None:
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        from PyQt5.QtWidgets import QApplication, QTableView
+        from price_model import PriceTableModel
+        self.app = QApplication.instance() or QApplication(sys.argv[:1])
+        self.model = PriceTableModel()
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.resize(280, 600)
+        self.view.show()
+
+    def update(self, symbols: List[str], snapshot: PriceSnapshot) -> float:
+        """Apply snapshot and process the resulting repaint; returns seconds"""
+        started = time.perf_counter()
+        self.model.set_symbols(symbols)
+        for quote in snapshot.quotes.values():
+            self.model.set_price(quote.symbol, quote.price, quote.profit)
+        for symbol in snapshot.failed:
+            self.model.set_error(symbol)
+        self.app.processEvents()
+        return time.perf_counter() - started
+
+
+def run_size(size: int, base: str, ticks: int, table: Optional[TableBench]) -> dict:
+    """Run ticks refreshes of size symbols and collect statistics"""
+    symbols = mock_symbols(size)
+    portfolio = Portfolio()
+    for symbol in symbols[::2]:
+        for lot in range(LOTS_PER_SYMBOL):
+            portfolio.add_trade(symbol, -5.0 if lot % 3 == 2 else 10.0, 1.0 + lot, lot, rebuild=False)
+    portfolio.rebuild()
+    engine = PriceEngine(
+        sources=[FxSource(FxRateCache(url=f'{base}/v4/latest/USD')), BinanceSource(api_base=f'{base}/api/v3')],
+        portfolio=portfolio
+    )
+    engine.tick(symbols)  # Warm up connections
+
+    latencies, table_costs, failures = [], [], 0
+    requests_before = request_count(base)
+    cpu_before = time.process_time()
+    for _ in range(ticks):
+        started = time.perf_counter()
+        snapshot = engine.tick(symbols)
+        latencies.append(time.perf_counter() - started)
+        failures += len(snapshot.failed)
+        if table:
+            table_costs.append(table.update(symbols, snapshot))
+    cpu = time.process_time() - cpu_before
+    requests = request_count(base) - requests_before
+    engine.close()
+
+    return {
+        'symbols': size,
+        'p50': percentile(latencies, 0.50) * 1000,
+        'p95': percentile(latencies, 0.95) * 1000,
+        'p99': percentile(latencies, 0.99) * 1000,
+        'requests': requests / ticks,
+        'cpu': cpu / ticks * 1000,
+        'table': (sum(table_costs) / len(table_costs) * 1000) if table_costs else None,
+        'failed': failures / ticks,
+    }
+
+
+def main() -> None:
+    """Benchmark the refresh path against a local mock Binance"""
+    parser = argparse.ArgumentParser(description='Refresh-path benchmark against a local mock Binance')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--ticks', type=int, default=DEFAULT_TICKS)
+    parser.add_argument('--latency', type=float, default=0.0, help='ms added by the mock per response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='ms of random extra mock latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of injected 500 responses')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='share of injected 429 responses')
+    parser.add_argument('--no-table', action='store_true', help='skip the Qt table-update measurement')
+    args = parser.parse_args()
+
+    table = None
+    if not args.no_table:
+        try:
+            table = TableBench()
+        except ImportError:
+            print("PyQt5 not available, skipping table-update cost")
+
+    process, base = start_mock(args)
+    try:
+        print(f"{'symbols':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/tick':>9} "
+              f"{'cpu ms':>8} {'table ms':>9} {'failed':>7}")
+        for size in args.sizes:
+            result = run_size(size, base, args.ticks, table)
+            table_text = f"{result['table']:9.2f}" if result['table'] is not None else f"{'-':>9}"
+            print(f"{result['symbols']:>8} {result['p50']:8.2f} {result['p95']:8.2f} {result['p99']:8.2f} "
+                  f"{result['requests']:9.2f} {result['cpu']:8.2f} {table_text} {result['failed']:7.2f}")
+    finally:
+        process.terminate()
+
+
+if __name__ == '__main__':
+    main()
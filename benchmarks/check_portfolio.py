@@ -0,0 +1,72 @@
+"""Check that legacy coin_data positions keep their P&L through the portfolio migration and a restart
+
+The first start migrates coin_data the way the widget does: positive holdings become lots in
+config['portfolio'], zero and short holdings stay in coin_data. The config is then written and
+read back, and each row's P&L must still be (price - entry_price) * current_holding.
+
+    python benchmarks/check_portfolio.py
+"""
+from typing import Dict
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from price_engine import PriceEngine  # noqa: E402
+from portfolio import Portfolio, split_coin_data  # noqa: E402
+
+# Constants
+COIN_DATA = {
+    'BTCUSDT': {'entry_price': 60000.0, 'current_holding': 0.5},
+    'ETHUSDT': {'entry_price': 3000.0, 'current_holding': -2.0},  # Short
+    'XRPUSDT': {'entry_price': 0.5, 'current_holding': 0},
+}
+PRICES = {'BTCUSDT': 65000.0, 'ETHUSDT': 3200.0, 'XRPUSDT': 0.6}
+
+
+def legacy_profit(symbol: str) -> float:
+    """Return the P&L the pre-portfolio widget showed for symbol"""
+    position = COIN_DATA[symbol]
+    return (PRICES[symbol] - position['entry_price']) * position['current_holding']
+
+
+def profits(portfolio: Portfolio) -> Dict[str, float]:
+    """Return the P&L of each priced row"""
+    engine = PriceEngine(sources=[], portfolio=portfolio)
+    snapshot = engine.publish(PRICES, 'check')
+    engine.close()
+    return {symbol: quote.profit for symbol, quote in snapshot.quotes.items()}
+
+
+def main() -> None:
+    failures = 0
+
+    def check(name: str, ok: bool) -> None:
+        nonlocal failures
+        failures += not ok
+        print(f"{'PASS' if ok else 'FAIL'}  {name}")
+
+    expected = {symbol: legacy_profit(symbol) for symbol in COIN_DATA}
+
+    # First start: config without a portfolio section
+    first = Portfolio.from_config(None, COIN_DATA)
+    check('the first start shows the legacy P&L', profits(first) == expected)
+
+    _, kept = split_coin_data(COIN_DATA)
+    config = json.loads(json.dumps({'portfolio': first.to_config(), 'coin_data': kept}))
+    check('only the long holding becomes a lot', list(config['portfolio']['lots']) == ['BTCUSDT'])
+    check('zero and short holdings stay in coin_data', set(config['coin_data']) == {'ETHUSDT', 'XRPUSDT'})
+
+    # Restart: the portfolio section exists now
+    restarted = Portfolio.from_config(config['portfolio'], config.get('coin_data'))
+    check('kept entries show their P&L after a restart', profits(restarted) == expected)
+    check('the short counts as held', restarted.held_symbols() == {'BTCUSDT', 'ETHUSDT'})
+    totals = restarted.totals()
+    check('totals include the short', abs(totals.unrealized - sum(expected.values())) < 1e-9
+          and totals.priced == totals.held == 2)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
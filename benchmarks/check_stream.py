@@ -0,0 +1,183 @@
+"""Check the price stream's stall handling against a local stand-in for the Binance WebSocket API
+
+A QWebSocketServer plays the exchange and a small TCP proxy sits in front of it. The check covers:
+prices arriving, a symbol going quiet (it must be handed back to polling), and a half-open connection
+(the proxy silently drops everything, so the watchdog must reconnect).
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/check_stream.py
+"""
+from typing import Callable, List, Set
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+from PyQt5.QtCore import QCoreApplication, QTimer
+from PyQt5.QtNetwork import QHostAddress
+from PyQt5.QtWebSockets import QWebSocketServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import price_stream  # noqa: E402
+from price_stream import PriceStream  # noqa: E402
+
+# Constants
+SYMBOLS = ['BTCUSDT', 'ETHUSDT']
+EVENT_INTERVAL = 100  # ms between miniTicker events per symbol
+WATCHDOG_INTERVAL = 200  # ms, shortened stream timings so the check runs in seconds
+STALL_TIMEOUT = 1.0  # seconds
+SYMBOL_STALL_TIMEOUT = 1.0  # seconds
+STEP_TIMEOUT = 10.0  # seconds to wait for each expected state
+
+
+class MockStreamServer:
+    """Answers SUBSCRIBE/UNSUBSCRIBE and pushes miniTicker events for subscribed, unmuted symbols"""
+
+    def __init__(self) -> None:
+        self.server = QWebSocketServer('mock-binance', QWebSocketServer.NonSecureMode)
+        self.server.newConnection.connect(self._on_connection)
+        self.clients = []
+        self.muted: Set[str] = set()
+        self.connections = 0
+        self.price = 100.0
+        self.timer = QTimer()
+        self.timer.timeout.connect(self._push)
+        self.timer.start(EVENT_INTERVAL)
+
+    def listen(self) -> int:
+        """Listen on a free local port and return it"""
+        if not self.server.listen(QHostAddress.LocalHost, 0):
+            raise RuntimeError(self.server.errorString())
+        return self.server.serverPort()
+
+    def _on_connection(self) -> None:
+        client = self.server.nextPendingConnection()
+        client.streams = set()
+        client.textMessageReceived.connect(lambda message, client=client: self._on_message(client, message))
+        client.disconnected.connect(lambda client=client: self.clients.remove(client))
+        self.clients.append(client)
+        self.connections += 1
+
+    def _on_message(self, client, message: str) -> None:
+        request = json.loads(message)
+        if request['method'] == 'SUBSCRIBE':
+            client.streams.update(request['params'])
+        elif request['method'] == 'UNSUBSCRIBE':
+            client.streams.difference_update(request['params'])
+        client.sendTextMessage(json.dumps({'result': None, 'id': request['id']}))
+
+    def _push(self) -> None:
+        self.price += 1
+        for client in self.clients:
+            for stream in client.streams:
+                symbol = stream.split('@')[0].upper()
+                if symbol not in self.muted:
+                    event = {'e': '24hrMiniTicker', 's': symbol, 'c': f'{self.price:.2f}'}
+                    client.sendTextMessage(json.dumps({'stream': stream, 'data': event}))
+
+
+class FreezingProxy:
+    """TCP relay whose current connections can be frozen: bytes are swallowed and the sockets stay open"""
+
+    def __init__(self, upstream_port: int) -> None:
+        self.upstream_port = upstream_port
+        self.listener = socket.create_server(('127.0.0.1', 0))
+        self.port = self.listener.getsockname()[1]
+        self.live: List[dict] = []
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def freeze(self) -> None:
+        """Half-open every current connection; new connections relay normally"""
+        for connection in self.live:
+            connection['frozen'] = True
+
+    def _accept(self) -> None:
+        while True:
+            downstream, _ = self.listener.accept()
+            upstream = socket.create_connection(('127.0.0.1', self.upstream_port))
+            connection = {'frozen': False}
+            self.live.append(connection)
+            threading.Thread(target=self._relay, args=(downstream, upstream, connection), daemon=True).start()
+            threading.Thread(target=self._relay, args=(upstream, downstream, connection), daemon=True).start()
+
+    @staticmethod
+    def _relay(source: socket.socket, target: socket.socket, connection: dict) -> None:
+        try:
+            while True:
+                data = source.recv(65536)
+                if not data:
+                    break
+                if not connection['frozen']:
+                    target.sendall(data)
+        except OSError:
+            pass
+        if not connection['frozen']:
+            target.close()
+
+
+def wait_for(app: QCoreApplication, condition: Callable[[], bool], timeout: float = STEP_TIMEOUT) -> bool:
+    """Run the event loop until condition holds or timeout expires"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        app.processEvents()
+        time.sleep(0.01)
+    return True
+
+
+def main() -> None:
+    """Run the checks and exit non-zero if any failed"""
+    parser = argparse.ArgumentParser(description='Check price stream stall handling against a local WebSocket server')
+    parser.parse_args()
+
+    price_stream.WATCHDOG_INTERVAL = WATCHDOG_INTERVAL
+    price_stream.STALL_TIMEOUT = STALL_TIMEOUT
+    price_stream.SYMBOL_STALL_TIMEOUT = SYMBOL_STALL_TIMEOUT
+
+    app = QCoreApplication(sys.argv)
+    server = MockStreamServer()
+    proxy = FreezingProxy(server.listen())
+    stream = PriceStream(f'ws://127.0.0.1:{proxy.port}/stream')
+    received = {}
+    stream.prices_ready.connect(received.update)
+    stream.set_symbols(SYMBOLS)
+    stream.start()
+
+    failures = 0
+
+    def check(name: str, ok: bool) -> None:
+        nonlocal failures
+        failures += not ok
+        print(f"{'PASS' if ok else 'FAIL'}  {name}")
+
+    check('prices arrive over the stream', wait_for(app, lambda: set(SYMBOLS) <= set(received)))
+    check('streamed symbols are not polled', all(stream.is_streaming(symbol) for symbol in SYMBOLS))
+
+    server.muted.add('ETHUSDT')
+    check('a quiet symbol goes back to polling', wait_for(app, lambda: not stream.is_streaming('ETHUSDT')))
+    check('the other symbol keeps streaming', stream.is_streaming('BTCUSDT'))
+    server.muted.clear()
+    check('the symbol streams again once it updates', wait_for(app, lambda: stream.is_streaming('ETHUSDT')))
+
+    # Pongs keep a connection alive even without events
+    server.muted.update(SYMBOLS)
+    wait_for(app, lambda: False, timeout=STALL_TIMEOUT * 3)
+    check('an idle but healthy connection is kept', stream.is_connected() and server.connections == 1)
+    server.muted.clear()
+
+    proxy.freeze()
+    check('a half-open connection is detected', wait_for(app, lambda: not stream.is_connected()))
+    check('everything is polled while it is down', not any(stream.is_streaming(symbol) for symbol in SYMBOLS))
+    check('the stream reconnects', wait_for(app, lambda: stream.is_connected() and server.connections == 2))
+    received.clear()
+    check('prices arrive after the reconnect', wait_for(app, lambda: set(SYMBOLS) <= set(received)))
+
+    stream.stop()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+from typing import List
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+import argparse
+import json
+import random
+import threading
+import time
+
+# Constants
+DEFAULT_SYMBOLS = 2000  # Size of the mock symbol universe
+ENDPOINT_WEIGHTS = {'/api/v3/ticker/price': 4, '/api/v3/exchangeInfo': 20}  # Binance request weights
+
+
+class MockState:
+    """Shared settings and counters of the mock server"""
+
+    def __init__(self, symbols: List[str], latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0) -> None:
+        self.symbols = symbols
+        self.latency = latency  # seconds added to every response
+        self.jitter = jitter  # seconds of uniform random extra latency
+        self.error_rate = error_rate  # share of requests answered with 500
+        self.rate_limit_rate = rate_limit_rate  # share of requests answered with 429
+        self.prices = {symbol: random.uniform(0.01, 50000) for symbol in symbols}
+        self.requests = 0
+        self.weight_minute = 0
+        self.used_weight = 0  # Weight used in the current minute, like X-MBX-USED-WEIGHT-1M
+        self.lock = threading.Lock()
+
+    def add_weight(self, weight: int) -> int:
+        """Count request weight in the current minute and return the total"""
+        minute = int(time.time() // 60)
+        with self.lock:
+            if minute != self.weight_minute:
+                self.weight_minute = minute
+                self.used_weight = 0
+            self.used_weight += weight
+            return self.used_weight
+
+    def next_prices(self, symbols: List[str]) -> List[dict]:
+        """Random-walk the requested symbols"""
+        result = []
+        with self.lock:
+            for symbol in symbols:
+                price = self.prices.get(symbol, 1.0) * random.uniform(0.999, 1.001)
+                self.prices[symbol] = price
+                result.append({'symbol': symbol, 'price': f'{price:.8f}'})
+        return result
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Serves /api/v3/ticker/price, /api/v3/exchangeInfo, /v4/latest/USD and /__stats"""
+
+    state: MockState = None
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real endpoints
+    disable_nagle_algorithm = True  # Headers and body go out in separate writes
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        state = self.state
+        if self.path == '/__stats':  # Counters for the benchmark, not counted itself
+            self.weight = state.used_weight
+            self._send(200, {'requests': state.requests})
+            return
+        with state.lock:
+            state.requests += 1
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        self.weight = state.add_weight(ENDPOINT_WEIGHTS.get(url.path, 1))
+        delay = state.latency + random.uniform(0, state.jitter)
+        if delay:
+            time.sleep(delay)
+
+        roll = random.random()
+        if roll < state.rate_limit_rate:
+            self._send(429, {'code': -1003, 'msg': 'Too many requests'}, {'Retry-After': '1'})
+            return
+        if roll < state.rate_limit_rate + state.error_rate:
+            self._send(500, {'code': -1000, 'msg': 'Injected error'})
+            return
+
+        if url.path == '/api/v3/ticker/price':
+            if 'symbols' in query:
+                self._send(200, state.next_prices(json.loads(query['symbols'][0])))
+            elif 'symbol' in query:
+                self._send(200, state.next_prices(query['symbol'])[0])
+            else:
+                self._send(200, state.next_prices(state.symbols))
+        elif url.path == '/api/v3/exchangeInfo':
+            self._send(200, {'symbols': [{'symbol': symbol, 'status': 'TRADING'} for symbol in state.symbols]})
+        elif url.path == '/v4/latest/USD':
+            self._send(200, {'base': 'USD', 'rates': {'USD': 1, 'KRW': 1380.5 + random.uniform(-1, 1)}})
+        else:
+            self._send(404, {'msg': 'Not found'})
+
+    def _send(self, status: int, body, headers: dict = None) -> None:
+        """Write a JSON response"""
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('X-MBX-USED-WEIGHT-1M', str(self.weight))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def mock_symbols(count: int = DEFAULT_SYMBOLS) -> List[str]:
+    """Return count synthetic USDT symbols"""
+    return [f'SYM{index}USDT' for index in range(count)]
+
+
+def start_server(state: MockState, port: int = 0) -> ThreadingHTTPServer:
+    """Start the mock server on a background thread; port 0 picks a free port"""
+    handler = type('BoundMockHandler', (MockHandler,), {'state': state})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    """Run the mock server in the foreground"""
+    parser = argparse.ArgumentParser(description='Local stand-in for the Binance and exchange-rate APIs')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--symbols', type=int, default=DEFAULT_SYMBOLS)
+    parser.add_argument('--latency', type=float, default=0.0, help='ms added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='ms of random extra latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of 500 responses (0-1)')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='share of 429 responses (0-1)')
+    args = parser.parse_args()
+
+    state = MockState(mock_symbols(args.symbols), args.latency / 1000, args.jitter / 1000,
+                      args.error_rate, args.rate_limit_rate)
+    server = start_server(state, args.port)
+    print(f"Mock Binance on http://127.0.0.1:{server.server_port}/api/v3 (Ctrl+C to stop)", flush=True)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
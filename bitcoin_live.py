@@ -1,60 +1,107 @@
-from typing import List, Tuple
+from startup_profile import profile  # First import: the zero point of --profile-startup
+from typing import Dict, List, Optional, Tuple
 import sys
-import requests
 import time
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QMenu, QAction, 
-    QTableWidget, QTableWidgetItem, QPushButton, 
+    QPushButton, 
     QVBoxLayout, QHBoxLayout, QLabel,
     QHeaderView
 )
-from PyQt5.QtCore import QTimer, Qt
-from PyQt5.QtGui import QColor
-import win32gui # type: ignore
-import win32con # type: ignore
-from layout_settings import create_layout, SettingsDialog, WINDOW_STYLE, TABLE_STYLE, setup_table, create_title_bar
-import json
-import webbrowser
+from PyQt5.QtCore import QTimer, Qt, QStringListModel
+from PyQt5.QtWidgets import QSystemTrayIcon, QStyle
+from layout_settings import (
+    create_layout, SettingsDialog, WINDOW_STYLE, TABLE_STYLE, setup_table, create_title_bar,
+    create_debug_overlay, TimedTableView, create_totals_table
+)
+from price_engine import PriceEngine, PriceSnapshot, Quote
+from providers import BinanceSource, create_sources
+from price_worker import PriceWorker
+from price_stream import PriceStream, BINANCE_STREAM_URL
+from symbol_cache import SymbolCache
+from price_snapshot import load_snapshot, save_snapshot
+from price_board import PriceBoard
+from kline_cache import KlineLoader, interval_seconds
+from kline_chart import KlineChart, CHART_HEIGHT
+from price_model import PriceTableModel, SparklineDelegate, HISTORY_COLUMN, ALERT_COLOR
+from price_history import PriceHistoryStore
+from coin_search import SymbolIndex
+from metrics import metrics
+from scheduler import PollScheduler, HELD_INTERVAL, WATCH_INTERVAL
+from http_client import client
+from config_store import ConfigStore
+from portfolio import Portfolio, split_coin_data
+from tick_recorder import TickRecorder, TickReader
+from tick_replay import TickReplay
+from price_alerts import AlertEngine, AlertTrigger, describe
+from price_hub import PriceHub, HubClient
+from i18n import catalog, DEFAULT_LANGUAGE
+import argparse
+# requests, webbrowser and the win32 modules are imported on first use, off the startup path
+
+profile.mark('imports')
 
 # Constants
-UPDATE_INTERVAL = 2500  # ms
-BINANCE_API_BASE = "https://api.binance.com/api/v3"
+SCHEDULER_INTERVAL = 500  # ms, how often the poll scheduler is asked for due symbols
+SNAPSHOT_INTERVAL = 60000  # ms, how often last-known prices are saved
+AGE_REFRESH_INTERVAL = 5000  # ms, how often the age shown on stale rows advances
+DEBUG_REFRESH_INTERVAL = 1000  # ms
+ALERT_FLASH_DURATION = 3000  # ms a row stays highlighted after an alert
+CHART_REFRESH_INTERVAL = 30000  # ms between kline tail fetches while the chart is shown
+CHART_INTERVAL = '15m'  # Default candle size, config['chart_interval'] overrides
+HUB_RETRY_DELAY = 1000  # ms before attaching again when another instance won the race to become the hub
+METRICS_EXPORT_INTERVAL = 15  # seconds, default for config['metrics_export']['interval']
 WINDOW_GEOMETRY = (300, 300, 270, 300)  # x, y, width, height
 
 class BTCPriceWidget(QWidget):
-    def __init__(self) -> None:
+    def __init__(self, record_path: Optional[str] = None, replay_path: Optional[str] = None,
+                 replay_speed: float = 1.0) -> None:
         super().__init__()
         self.selected_coins: List[str] = []
         self.coins: List[Tuple[str, str]] = []
+        self.coin_index = SymbolIndex()  # Search index over self.coins
+        self.coin_model = QStringListModel(self)  # Every symbol, shared with the settings dialog
+        self.settings_dialog = None  # Built on first open, then reused
         self.config = {}  # Dictionary for storing settings
         self.languages = {}  # Dictionary for language data
         self.previous_prices = {}  # Dictionary for storing previous prices
+        self.last_prices = load_snapshot()  # Last-known prices shown until live data arrives
+        self.price_history = PriceHistoryStore()  # Bounded per-symbol history for sparklines
         self.drag_pos = None
         self.window_size = {'width': 270, 'height': 300}  # Default window size
         
         self.load_language()  # Load language file
         self.load_config()  # Load configuration file
+        profile.mark('config')
+        self._init_recording(record_path, replay_path, replay_speed)
+        self._migrate_portfolio()
+        self._init_alerts()
+        # Fetching and P&L, GUI-free; config['providers'] picks the active exchanges (default: all)
+        self.engine = PriceEngine(create_sources(self.config.get('providers')), self.portfolio)
+        self.price_worker = PriceWorker(self.engine, self)  # Runs engine ticks in the background
+        self.price_worker.snapshot_ready.connect(self._on_poll_snapshot)
+        self._init_scheduler()
+        profile.mark('engine')
         self._init_ui()
+        self._init_chart()
         self._init_timer()
+        profile.mark('ui')
         self._load_coins()
-        self.update_price()
+        profile.mark('coins')
+        self._init_stream()
+        profile.mark('stream')
+        self._show_snapshot()
+        profile.mark('snapshot')
+        # First live fetch runs once the window is visible
+        QTimer.singleShot(0, self.update_price)
 
     def load_language(self) -> None:
-        """Load language file"""
-        try:
-            with open('language.json', 'r', encoding='utf-8') as f:
-                self.languages = json.load(f)
-        except Exception as e:
-            print(f"Error loading language file: {e}")
-            self.languages = {}
+        """Load language file (parsed once, shared with the settings dialog)"""
+        self.languages = catalog.languages
 
     def get_text(self, key: str) -> str:
         """Return text based on the current language"""
-        current_language = self.config.get('language', 'kr')
-        try:
-            return self.languages[current_language][key]
-        except:
-            return key
+        return catalog.text(self.config.get('language', DEFAULT_LANGUAGE), key)
 
     def update_texts(self) -> None:
         """Update UI texts"""
@@ -63,38 +110,55 @@ class BTCPriceWidget(QWidget):
         if title_label:
             title_label.setText(self.get_text('coin_price'))
         
+        # The totals row is keyed by its label, so a new label needs its totals again
+        total_label = self.get_text('total')
+        if self.totals_model.symbol_at(0) != total_label:
+            self.totals_model.set_symbols([total_label])
+            if len(self.portfolio):
+                self.totals_model.set_totals(total_label, self.portfolio.totals())
+        
         # Update context menu text for right-click
         self.price_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.price_table.customContextMenuRequested.connect(self.show_context_menu)
 
     def load_config(self) -> None:
-        """Load information from configuration file"""
+        """Load information from configuration file (validated, with fallback to the last good copy)"""
+        self.config_store = ConfigStore(parent=self)
+        self.config = self.config_store.data
+        self.selected_coins = self.config['selected_coins']
+        self.setWindowOpacity(self.config['opacity'] / 100)
+        self.always_on_top = bool(self.config['always_on_top'])
+        # Load window size
+        self.window_size = self.config['window_size']
+        self.setFixedSize(self.window_size['width'], self.window_size['height'])
+        QTimer.singleShot(100, lambda: self.apply_always_on_top(self.always_on_top))
+        self.load_portfolio()
+
+    def load_portfolio(self) -> None:
+        """Load lots from config['portfolio'], or from a legacy coin_data section"""
+        self.portfolio_loaded = False  # Migration must not replace positions that failed to load
         try:
-            with open('config.json', 'r') as f:
-                self.config = json.load(f)
-                self.selected_coins = self.config.get('selected_coins', [])
-                self.setWindowOpacity(self.config.get('opacity', 100) / 100)
-                always_on_top = self.config.get('always_on_top', 0)
-                # Load window size
-                window_size = self.config.get('window_size', {'width': 270, 'height': 300})
-                self.window_size = window_size
-                self.setFixedSize(window_size['width'], window_size['height'])
-                QTimer.singleShot(100, lambda: self.apply_always_on_top(always_on_top))
-                self.coin_data = self.config.get('coin_data', {}) # Load coin data
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"Config load error: {e}")
-            self.config = {
-                'selected_coins': [],
-                'opacity': 100,
-                'always_on_top': 0,
-                'language': 'kr',
-                'window_size': {'width': 270, 'height': 300},
-                'coin_data': {} # Initialize coin_data
-            }
-            self.selected_coins = []
-            self.setWindowOpacity(1.0)
-            self.setFixedSize(270, 300)
-            self.coin_data = {}
+            self.portfolio = Portfolio.from_config(self.config.get('portfolio'), self.config.get('coin_data'))
+            self.portfolio_loaded = True
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Portfolio load error: {e}")
+            self.portfolio = Portfolio()
+
+    def _migrate_portfolio(self) -> None:
+        """Replace a legacy coin_data section with config['portfolio'] once
+
+        Only for a config read from disk (never defaults after a failed load) and never in replay sessions.
+        """
+        if self.replay is not None or self.config_store.loaded_from is None or not self.portfolio_loaded:
+            return
+        if 'portfolio' not in self.config and 'coin_data' in self.config:
+            self.config_store.update(portfolio=self.portfolio.to_config())
+            # Zero and short holdings are not lots; they stay in coin_data, which from_config keeps reading
+            _, kept = split_coin_data(self.config['coin_data'])
+            if kept:
+                self.config_store.update(coin_data=kept)
+            else:
+                self.config_store.remove('coin_data')
 
     def apply_always_on_top(self, value: int) -> None:
         """Apply always on top setting"""
@@ -104,7 +168,10 @@ class BTCPriceWidget(QWidget):
 
     def toggle_always_on_top(self, state: bool) -> None:
         """Set always on top"""
+        self.always_on_top = bool(state)  # Tracked here so saving never has to ask win32
         try:
+            import win32gui # type: ignore
+            import win32con # type: ignore
             hwnd = self.winId().__int__()
             
             if state:
@@ -119,21 +186,16 @@ class BTCPriceWidget(QWidget):
             print(f"Error in toggle_always_on_top: {e}")  # For debugging
 
     def save_config(self) -> None:
-        """Save configuration"""
-        self.config.update({
-            'selected_coins': self.selected_coins,
-            'opacity': int(self.windowOpacity() * 100),
-            'always_on_top': int(self.isAlwaysOnTop()),
-            'language': self.config.get('language', 'kr'),
-            'window_size': self.window_size,  # Save window size
-            'coin_data': self.coin_data  # Save coin data
-        })
-        
-        try:
-            with open('config.json', 'w') as f:
-                json.dump(self.config, f, indent=4)
-        except Exception as e:
-            print(f"Config save error: {e}")
+        """Save configuration (only changed fields trigger a write, bursts are coalesced)"""
+        if self.replay is not None:
+            return
+        self.config_store.update(
+            selected_coins=self.selected_coins,
+            opacity=round(self.windowOpacity() * 100),
+            always_on_top=int(self.always_on_top),
+            language=self.config.get('language', 'kr'),
+            window_size=self.window_size  # Save window size
+        )
 
     def _init_ui(self) -> None:
         """Initialize UI"""
@@ -155,45 +217,270 @@ class BTCPriceWidget(QWidget):
         # Connect close button click event
         close_button.clicked.connect(self.close)
         
-        # Set up table widget
-        self.price_table = QTableWidget(self)
-        setup_table(self.price_table)
+        # Set up table view backed by the price model
+        self.price_model = PriceTableModel(self)
+        self.price_model.set_symbols(self.selected_coins)
+        if self.config.get('board') == 'painted':
+            # Rows painted directly, dirty rows only, at most ~30 repaints/s (for slow remote desktops)
+            self.price_table = PriceBoard(self)
+            self.price_table.setModel(self.price_model)
+        else:
+            self.price_table = TimedTableView(self)
+            self.price_table.setModel(self.price_model)
+            self.price_table.setItemDelegateForColumn(HISTORY_COLUMN, SparklineDelegate(self.price_table))
+            setup_table(self.price_table)
         
         # Set up context menu and double-click events
         self.price_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.price_table.customContextMenuRequested.connect(self.show_context_menu)
-        self.price_table.cellDoubleClicked.connect(self.open_trading_page)
+        self.price_table.doubleClicked.connect(lambda index: self.open_trading_page(index.row(), index.column()))
         
         main_layout.addWidget(self.price_table)
+        
+        # Candle chart of the selected row, expanded from the context menu
+        self.chart = KlineChart(self)
+        self.chart.hide()
+        main_layout.addWidget(self.chart)
+        
+        # Portfolio totals, pinned below the scrolling board
+        self.totals_model = PriceTableModel(self)
+        self.totals_model.set_symbols([self.get_text('total')])
+        self.totals_table = create_totals_table(self, self.totals_model)
+        self.totals_table.setVisible(bool(self.portfolio.held_symbols()))  # Fully sold symbols do not count
+        main_layout.addWidget(self.totals_table)
         self.setLayout(main_layout)
         
+        # Hidden debug overlay, toggled from the title bar
+        self.debug_overlay = create_debug_overlay(self)
+        title_bar.findChild(QPushButton, "debug_button").clicked.connect(self.toggle_debug_overlay)
+        
         # Set overall window style
         self.setStyleSheet(WINDOW_STYLE)
 
+    def _init_scheduler(self) -> None:
+        """Create the poll scheduler; config['poll_intervals'] overrides the held/watch cadence in seconds"""
+        intervals = self.config.get('poll_intervals')
+        if not isinstance(intervals, dict):
+            intervals = {}
+        self.scheduler = PollScheduler(
+            held_interval=float(intervals.get('held', HELD_INTERVAL)),
+            watch_interval=float(intervals.get('watch', WATCH_INTERVAL))
+        )
+
+    def _init_chart(self) -> None:
+        """Set up kline loading for the chart; config['chart_interval'] sets the candle size"""
+        self.chart_interval = self.config.get('chart_interval', CHART_INTERVAL)
+        try:
+            interval_seconds(self.chart_interval)
+        except (KeyError, ValueError, TypeError, IndexError):
+            print(f"Invalid chart interval: {self.chart_interval}")
+            self.chart_interval = CHART_INTERVAL
+        self.kline_loader = KlineLoader(self)
+        self.kline_loader.klines_ready.connect(self.chart.set_series)
+        self.chart_timer = QTimer(self)
+        self.chart_timer.timeout.connect(self._refresh_chart)
+        # While expanded, the chart follows the selected row
+        self.price_table.selectionModel().currentRowChanged.connect(self._on_current_row_changed)
+
+    def _chart_source(self, coin: Optional[str]):
+        """Return the provider that has candles for coin, or None"""
+        if coin is None or self.replay is not None:  # Replays run without network
+            return None
+        source = self.engine.source_for(coin)
+        return source if source is not None and source.has_klines else None
+
+    def toggle_chart(self) -> None:
+        """Expand the candle chart for the selected row, or collapse it"""
+        coin = self.price_model.symbol_at(self.price_table.currentIndex().row())
+        if not self.chart.isHidden() and coin in (None, self.chart.symbol):
+            self.chart.hide()
+            self.chart_timer.stop()
+            self._apply_window_size()
+        elif self._chart_source(coin) is not None:
+            self.show_chart(coin)
+
+    def show_chart(self, coin: str) -> None:
+        """Show cached candles of coin at once and fetch only the missing tail"""
+        self.chart.set_symbol(coin, self.chart_interval)
+        if self.chart.isHidden():
+            self.chart.show()
+            self._apply_window_size()
+        self._refresh_chart()
+        self.chart_timer.start(CHART_REFRESH_INTERVAL)
+
+    def _refresh_chart(self) -> None:
+        """Fetch new candles of the charted symbol"""
+        source = self._chart_source(self.chart.symbol)
+        if source is not None:
+            self.kline_loader.request(source, self.chart.symbol, self.chart_interval)
+
+    def _on_current_row_changed(self, current, previous) -> None:
+        """Chart the newly selected row while the chart is expanded"""
+        coin = self.price_model.symbol_at(current.row())
+        if not self.chart.isHidden() and coin != self.chart.symbol and self._chart_source(coin) is not None:
+            self.show_chart(coin)
+
+    def _apply_window_size(self) -> None:
+        """Fix the window to the configured size, plus the chart while it is expanded"""
+        extra = 0 if self.chart.isHidden() else CHART_HEIGHT
+        self.setFixedSize(self.window_size['width'], self.window_size['height'] + extra)
+
     def _init_timer(self) -> None:
         """Initialize price update timer"""
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_price)
-        self.timer.start(UPDATE_INTERVAL)
+        self.timer.start(SCHEDULER_INTERVAL)
+        
+        self.debug_timer = QTimer(self)
+        self.debug_timer.timeout.connect(self._update_debug_overlay)
+        
+        # Optional metrics dump: {"path": "metrics.prom", "format": "prometheus" | "json", "interval": 15}
+        export = self.config.get('metrics_export')
+        if isinstance(export, dict) and export.get('path'):
+            self.metrics_timer = QTimer(self)
+            self.metrics_timer.timeout.connect(self.export_metrics)
+            self.metrics_timer.start(int(export.get('interval', METRICS_EXPORT_INTERVAL) * 1000))
+        
+        # Periodically persist last-known prices for the next startup
+        self.snapshot_timer = QTimer(self)
+        self.snapshot_timer.timeout.connect(self.save_snapshot)
+        self.snapshot_timer.start(SNAPSHOT_INTERVAL)
+        
+        self.age_timer = QTimer(self)
+        self.age_timer.timeout.connect(self.price_model.refresh_ages)
+        self.age_timer.start(AGE_REFRESH_INTERVAL)
+
+    def _show_snapshot(self) -> None:
+        """Paint last-known prices, marked as stale"""
+        if self.replay is not None:
+            return
+        for coin in self.selected_coins:
+            entry = self.last_prices.get(coin)
+            if entry:
+                quote = self.engine.quote(coin, entry['price'], 'snapshot', entry.get('time', 0))
+                self._update_coin_price(quote, stale=True)
+        # Totals from last-known prices until the first live tick replaces them
+        self.portfolio.mark({coin: entry['price'] for coin, entry in self.last_prices.items()})
+        if len(self.portfolio):
+            self.totals_model.set_totals(self.totals_model.symbol_at(0), self.portfolio.totals())
+
+    def save_snapshot(self) -> None:
+        """Save last-known prices of selected coins"""
+        if self.replay is not None:
+            return
+        if self.recorder is not None:
+            self.recorder.flush()
+        save_snapshot({coin: self.last_prices[coin] for coin in self.selected_coins if coin in self.last_prices})
+
+    def _init_recording(self, record_path: Optional[str], replay_path: Optional[str], speed: float) -> None:
+        """Open the tick recorder and/or the replay source given on the command line"""
+        self.recorder = None
+        self.replay = None
+        if replay_path:
+            try:
+                reader = TickReader(replay_path)
+            except (OSError, ValueError) as e:
+                print(f"Replay load error: {e}")
+            else:
+                self.replay = TickReplay(reader, speed, self)
+                self.replay.prices_ready.connect(self._on_replay_prices)
+                self.replay.finished.connect(lambda: print(f"Replay finished: {len(reader)} records"))
+                # The board shows the recorded symbols; replay sessions never touch config or snapshot files
+                self.selected_coins = reader.symbols()
+        elif record_path:
+            try:
+                self.recorder = TickRecorder(record_path)
+            except (OSError, ValueError) as e:
+                print(f"Tick recorder error: {e}")
+
+    def _init_alerts(self) -> None:
+        """Load price alerts from config['alerts']"""
+        self.alerts = AlertEngine()
+        self.alerts.load(self.config.get('alerts', []))
+        self.tray = None  # Created on the first alert
+
+    def _notify_alert(self, trigger: AlertTrigger) -> None:
+        """Flash the row and show a tray notification when the platform has a tray"""
+        symbol = trigger.alert.symbol
+        metrics.inc('price_alerts_fired_total', kind=trigger.alert.kind)
+        self.price_model.set_flash(symbol, ALERT_COLOR)
+        QTimer.singleShot(ALERT_FLASH_DURATION, lambda: self.price_model.set_flash(symbol, None))
+        if QSystemTrayIcon.isSystemTrayAvailable():
+            if self.tray is None:
+                self.tray = QSystemTrayIcon(self.style().standardIcon(QStyle.SP_MessageBoxInformation), self)
+                self.tray.show()
+            self.tray.showMessage(self.get_text('price_alert'), describe(trigger),
+                                  QSystemTrayIcon.Information, ALERT_FLASH_DURATION)
+        print(f"Price alert: {describe(trigger)}")  # For debugging
+
+    def _init_stream(self) -> None:
+        """Start the WebSocket price stream; polling covers whatever it cannot deliver"""
+        self.hub = None  # Set while this instance fetches for the other instances on the machine
+        self.hub_client = None  # Set while another instance fetches for this one
+        self.price_stream = PriceStream(self.config.get('stream_url', BINANCE_STREAM_URL), parent=self)
+        self.price_stream.prices_ready.connect(self._on_stream_prices)
+        self.price_stream.set_symbols(self.selected_coins)
+        if self.replay is not None:
+            self.replay.start()  # Offline: the recording replaces stream and polling
+        elif self.config.get('price_hub', True):
+            self._join_hub()
+        else:
+            self._start_stream()
+
+    def _start_stream(self) -> None:
+        """Start streaming unless config['price_source'] asks for polling only"""
+        if self.config.get('price_source', 'stream') == 'stream':
+            self.price_stream.start()
+
+    def _join_hub(self) -> None:
+        """Attach to the price hub of a running instance, or become the hub when there is none"""
+        client = HubClient(parent=self)
+        if client.connect_to_hub():
+            self.hub_client = client
+            client.prices_ready.connect(self._on_hub_prices)
+            client.disconnected.connect(self._on_hub_lost)
+            self.price_stream.stop()  # The hub streams and polls for every instance
+            return
+        client.deleteLater()
+        
+        hub = PriceHub(parent=self)
+        if hub.listen():
+            self.hub = hub
+            hub.subscriptions_changed.connect(self.coins_changed)
+        else:
+            # Another instance became the hub first; fetch alone until it accepts connections
+            hub.deleteLater()
+            QTimer.singleShot(HUB_RETRY_DELAY, self._join_hub)
+        self._start_stream()
+
+    def _on_hub_lost(self) -> None:
+        """The hub instance closed: the first remaining instance to listen takes over the fetch loop"""
+        print("Price hub closed, reconnecting")  # For debugging
+        self.hub_client.deleteLater()
+        self.hub_client = None
+        self._join_hub()
+        self.coins_changed()
+
+    def _feed_symbols(self) -> List[str]:
+        """Return the symbols this instance fetches: its own plus, as the hub, every attached instance's"""
+        if self.hub is None or not len(self.hub):
+            return self.selected_coins
+        return list(dict.fromkeys(self.selected_coins + sorted(self.hub.symbols())))
 
     def _load_coins(self) -> None:
-        """Load coin list from Binance API"""
-        try:
-            response = requests.get(f'{BINANCE_API_BASE}/exchangeInfo')
-            response.raise_for_status()
-            data = response.json()
-            
-            # Add KRW-USD pair at the beginning
-            self.coins = [('KRW-USD', 'KRW-USD')]
-            
-            # Add existing coin list
-            self.coins.extend([
-                (symbol['symbol'], symbol['symbol'])
-                for symbol in data['symbols']
-                if 'USDT' in symbol['symbol']
-            ])
-        except requests.RequestException as e:
-            print(f"Failed to load coin list: {e}")
+        """Load coin list from the local cache and revalidate it in the background"""
+        self.symbol_cache = SymbolCache(self.engine.sources, self)
+        self.symbol_cache.symbols_ready.connect(self._set_coins)
+        with metrics.timer('load_coins_seconds'):
+            self._set_coins(self.symbol_cache.load())
+        if self.replay is None:  # Replays run without network
+            self.symbol_cache.refresh_if_stale()
+
+    def _set_coins(self, symbols: List[str]) -> None:
+        """Replace the coin list (every provider's symbols, FX pairs first)"""
+        self.coins = [(symbol, symbol) for symbol in symbols]
+        self.coin_index.build([coin[0] for coin in self.coins])
+        self.coin_model.setStringList(self.coin_index.symbols)
 
     def show_context_menu(self, position) -> None:
         """Show right-click context menu"""
@@ -202,17 +489,25 @@ class BTCPriceWidget(QWidget):
         delete_action.triggered.connect(lambda: self.delete_selected_coin())
         menu.addAction(delete_action)
         
+        # Candle chart of the row, for providers that have klines
+        coin = self.price_model.symbol_at(self.price_table.currentIndex().row())
+        if self._chart_source(coin) is not None:
+            charted = not self.chart.isHidden() and coin == self.chart.symbol
+            chart_action = QAction(self.get_text('hide_chart' if charted else 'chart'), self)
+            chart_action.triggered.connect(self.toggle_chart)
+            menu.addAction(chart_action)
+        
         # Show menu at current cursor position
         menu.exec_(self.price_table.viewport().mapToGlobal(position))
 
     def delete_selected_coin(self) -> None:
         """Delete selected coin"""
-        current_row = self.price_table.currentRow()
+        current_row = self.price_table.currentIndex().row()
         if current_row >= 0:
-            coin = self.price_table.item(current_row, 0).text()
+            coin = self.price_model.symbol_at(current_row)
             if coin in self.selected_coins:
                 self.selected_coins.remove(coin)
-                self.update_price()
+                self.coins_changed()
                 self.save_config()
 
     def on_fade_out_finished(self, new_flags):  # new_flags 파라미터 추가
@@ -232,98 +527,209 @@ class BTCPriceWidget(QWidget):
         selected_coin = self.coin_selector.currentText()
         if selected_coin and selected_coin not in self.selected_coins:
             self.selected_coins.append(selected_coin)
-            self.update_price()
+            self.coins_changed()
 
     def change_opacity(self, value: int) -> None:
         """Change window opacity"""
         self.setWindowOpacity(value / 100)
+        self.save_config()
+
+    def coins_changed(self) -> None:
+        """Apply a change of selected_coins (or of the hub's subscriptions) to the stream and the table"""
+        self.price_stream.set_symbols(self._feed_symbols())
+        self.update_price()
 
     def update_price(self) -> None:
-        """Update prices of selected coins"""
-        self.price_table.setRowCount(len(self.selected_coins))
+        """Request prices of selected coins from the background worker"""
+        self.price_model.set_symbols(self.selected_coins)
+        self.price_history.retain(self.selected_coins)
+        if self.replay is not None:
+            return  # Prices come from the recording only
+        held = self.portfolio.held_symbols()
+        if self.hub_client is not None:
+            # Another instance fetches; it only needs to know what this one shows
+            self.hub_client.set_symbols(self.selected_coins, held)
+            return
+        
+        # Only poll what the stream delivers nothing for (everything while it is down or stalled)
+        coins = [coin for coin in self._feed_symbols() if not self.price_stream.is_streaming(coin)]
+        if self.hub is not None:
+            held |= self.hub.held_symbols()
+        
+        # Held positions refresh fastest, watch-only rows slower, everything slows down near the weight budget
+        # Only Binance polls count toward Binance's weight budget
+        weighted = {coin for coin in coins if isinstance(self.engine.source_for(coin), BinanceSource)}
+        self.scheduler.set_symbols(coins, held, weighted)
+        due = self.scheduler.due()
         
-        for index, coin in enumerate(self.selected_coins):
-            self._update_coin_price(index, coin)
+        # Skipped when the previous fetch is still running; due symbols stay due for the next check
+        if due and self.price_worker.request(due):
+            self.scheduler.mark_requested(due)
 
-    def _update_coin_price(self, index: int, coin: str) -> None:
-        """Update individual coin price"""
-        try:
-            if coin == 'KRW-USD':
-                response = requests.get('https://api.exchangerate-api.com/v4/latest/USD')
-                data = response.json()
-                current_price = data['rates']['KRW']
-                
-                self.price_table.setItem(index, 0, QTableWidgetItem('KRW-USD'))
-                price_item = QTableWidgetItem(f'{current_price:.2f}')
-            else:
-                response = requests.get(f'{BINANCE_API_BASE}/ticker/price?symbol={coin}')
-                response.raise_for_status()
-                data = response.json()
-                current_price = float(data['price'])
-                
-                self.price_table.setItem(index, 0, QTableWidgetItem(coin))
-                price_item = QTableWidgetItem(f'{current_price:.4f}')
-            
-            # Set default color (white)
-            price_item.setForeground(QColor("#EAECEF"))
-            price_item.setTextAlignment(Qt.AlignRight)
-            self.price_table.setItem(index, 1, price_item)
-
-            # Calculate and display profit
-            profit_item = QTableWidgetItem("")
-            if coin in self.coin_data:
-                entry_price = self.coin_data[coin].get('entry_price')
-                current_holding = self.coin_data[coin].get('current_holding')
-                if entry_price is not None and current_holding is not None:
-                    profit = (current_price - entry_price) * current_holding
-                    profit_sign = "+" if profit >= 0 else "-"
-                    profit_item.setText(f'{profit_sign}  {abs(profit):,.2f}')
-                    if profit >= 0:
-                        profit_item.setForeground(QColor("#00FF7F")) # Green for profit
-                    else:
-                        profit_item.setForeground(QColor("#F6465D")) # Red for loss
-                else:
-                    profit_item.setText("") # Display empty string instead of N/A
-                    # profit_item.setForeground(QColor("#848E9C")) # Remove foreground color for empty
-            else:
-                profit_item.setText("") # Display empty string instead of N/A
-                # profit_item.setForeground(QColor("#848E9C")) # Remove foreground color for empty
-            
-            profit_item.setTextAlignment(Qt.AlignRight)
-            self.price_table.setItem(index, 2, profit_item) # Set profit to the third column
-            
-        except requests.RequestException as e:
-            self.price_table.setItem(index, 0, QTableWidgetItem(coin))
-            error_item = QTableWidgetItem("Error")
-            error_item.setForeground(QColor("#F6465D"))  # Error is displayed in red
-            self.price_table.setItem(index, 1, error_item)
-            self.price_table.setItem(index, 2, QTableWidgetItem("Error")) # Also show error in profit column
+    def _on_poll_snapshot(self, snapshot: PriceSnapshot) -> None:
+        """Feed a polled snapshot's outcome and Binance's reported weight back into the scheduler"""
+        self.scheduler.observe_weight(client.used_weight, client.weight_time)
+        self.scheduler.record_success(snapshot.quotes)
+        self.scheduler.record_failure(snapshot.failed)
+        self._on_snapshot(snapshot)
+
+    def _on_snapshot(self, snapshot: PriceSnapshot) -> None:
+        """Update table rows from an engine snapshot"""
+        if self.recorder is not None or self.hub:
+            prices = {coin: quote.price for coin, quote in snapshot.quotes.items()}
+            if self.recorder is not None:
+                self.recorder.record(prices, snapshot.time)
+            if self.hub:
+                self.hub.publish(prices, snapshot.failed, snapshot.time)  # Each attached instance gets its symbols
+        with metrics.timer('table_update_seconds'):
+            for coin in self.selected_coins:
+                if coin in snapshot.quotes:
+                    self._update_coin_price(snapshot.quotes[coin])
+                elif coin in snapshot.failed:
+                    self._show_coin_error(coin)
+            if snapshot.totals is not None:
+                self.totals_model.set_totals(self.totals_model.symbol_at(0), snapshot.totals)
+
+    def _on_stream_prices(self, prices: Dict[str, float]) -> None:
+        """Update table rows from a merged batch of stream events"""
+        self._on_snapshot(self.engine.publish(prices, 'stream'))
+
+    def _on_replay_prices(self, prices: Dict[str, float], timestamp: float) -> None:
+        """Update table rows from a replayed batch, timestamped with its recorded time"""
+        self._on_snapshot(self.engine.publish(prices, 'replay', timestamp))
+
+    def _on_hub_prices(self, prices: Dict[str, float], failed: List[str], timestamp: float) -> None:
+        """Update table rows from prices fetched by the hub instance (P&L uses this instance's portfolio)"""
+        self._on_snapshot(self.engine.publish(prices, 'hub', timestamp, failed))
+
+    def _update_coin_price(self, quote: Quote, stale: bool = False) -> None:
+        """Update individual coin price (stale marks a last-known price from the snapshot file)"""
+        coin = quote.symbol
+        if not stale:
+            if self.price_history.record(coin, quote.price, quote.time):
+                self.price_model.set_history(coin, self.price_history.get(coin))
+            # Only thresholds between the previous and this price are looked at
+            for trigger in self.alerts.check(coin, quote.price, quote.time, self.price_history.get(coin)):
+                self._notify_alert(trigger)
+            self.last_prices[coin] = {'price': quote.price, 'profit': quote.profit, 'time': quote.time}
+            # Unchanged live price: nothing to repaint
+            if self.previous_prices.get(coin) == quote.price:
+                return
+            self.previous_prices[coin] = quote.price
+        
+        self.price_model.set_price(coin, quote.price, quote.profit, quote.time if stale else None)
+
+    def _show_coin_error(self, coin: str) -> None:
+        """Mark a row whose price could not be fetched; a known price stays up, greyed with its age"""
+        self.previous_prices.pop(coin, None)
+        entry = self.last_prices.get(coin)
+        if entry:
+            quote = self.engine.quote(coin, entry['price'], 'snapshot', entry.get('time', 0))
+            self._update_coin_price(quote, stale=True)
+        else:
+            self.price_model.set_error(coin)
 
     def open_trading_page(self, row: int, column: int) -> None:
         """Open exchange page for double-clicked coin"""
         try:
-            coin = self.price_table.item(row, 0).text()
-            
-            if coin == 'KRW-USD':
-                url = 'https://www.tradingview.com/chart/?symbol=FX_IDC%3AUSDKRW'
-            else:
-                # Handle USDT pairs
-                base_symbol = coin.replace('USDT', '')
-                url = f'https://www.binance.com/en/trade/{base_symbol}_USDT'
+            coin = self.price_model.symbol_at(row)
+            url = self.engine.trading_url(coin)  # Each provider knows its own trading page
+            if url is None:
+                return
             
             print(f"Opening URL: {url}")  # For debugging
+            import webbrowser
             webbrowser.open(url)
         except Exception as e:
             print(f"Failed to open URL: {e}")
 
     def open_settings_dialog(self) -> None:
-        """Open settings dialog"""
-        dialog = SettingsDialog(self, self)  # Set current widget as parent
-        dialog.exec_()  # Run as modal
+        """Open settings dialog (built on first use, then reused with only changed state refreshed)"""
+        if self.settings_dialog is None:
+            self.settings_dialog = SettingsDialog(self, self)  # Set current widget as parent
+        else:
+            self.settings_dialog.load_settings()
+        self.settings_dialog.exec_()  # Run as modal
         self.save_config()  # Save configuration after changes
 
+    def toggle_debug_overlay(self) -> None:
+        """Show or hide the debug overlay"""
+        if self.debug_overlay.isVisible():
+            self.debug_timer.stop()
+            self.debug_overlay.hide()
+        else:
+            self.debug_overlay.setGeometry(self.price_table.geometry())
+            self._update_debug_overlay()
+            self.debug_overlay.show()
+            self.debug_overlay.raise_()
+            self.debug_timer.start(DEBUG_REFRESH_INTERVAL)
+
+    def _update_staleness(self) -> None:
+        """Set the per-symbol age of the last live price"""
+        now = time.time()
+        metrics.clear_gauge('price_staleness_seconds')
+        for coin in self.selected_coins:
+            if coin in self.last_prices:
+                metrics.set_gauge('price_staleness_seconds', now - self.last_prices[coin]['time'], symbol=coin)
+
+    def _update_debug_overlay(self) -> None:
+        """Render timings, errors and staleness into the overlay"""
+        self._update_staleness()
+        data = metrics.to_dict()
+        lines = []
+        for name in ('price_tick_seconds', 'table_update_seconds', 'table_paint_seconds'):
+            for series in data['histograms'].get(name, []):
+                lines.append(f"{name[:-8]}: p50 {series['p50'] * 1000:g} p95 {series['p95'] * 1000:g} ms n={series['count']}")
+        errors = {}
+        for series in data['counters'].get('http_errors_total', []):
+            errors[series['endpoint']] = errors.get(series['endpoint'], 0) + series['value']
+        for series in data['histograms'].get('http_request_seconds', []):
+            endpoint = series['endpoint'].split('/')[-1]
+            lines.append(f"{endpoint}: p95 {series['p95'] * 1000:g} ms n={series['count']} "
+                         f"err={errors.get(series['endpoint'], 0):g}")
+        for series in data['histograms'].get('http_json_parse_seconds', []):
+            lines.append(f"json {series['endpoint'].split('/')[-1]}: p95 {series['p95'] * 1000:g} ms")
+        stale = [f"{series['symbol']} {series['value']:.0f}s" for series in data['gauges'].get('price_staleness_seconds', [])]
+        if stale:
+            lines.append("age: " + ", ".join(stale))
+        tripped = [series['circuit'] for series in data['gauges'].get('circuit_open', []) if series['value']]
+        if tripped:
+            lines.append("circuit open: " + ", ".join(tripped))
+        self.debug_overlay.setText("\n".join(lines) or "No data yet")
+
+    def export_metrics(self) -> None:
+        """Write the metrics dump configured in config['metrics_export']"""
+        export = self.config.get('metrics_export', {})
+        self._update_staleness()
+        metrics.write(export['path'], export.get('format', 'prometheus'))
+
+    def paintEvent(self, event) -> None:
+        """Paint the window; the first paint ends the startup profile"""
+        super().paintEvent(event)
+        if not profile.finished:
+            profile.finish()
+
+    def closeEvent(self, event) -> None:
+        """Stop background fetching when the window closes"""
+        self.price_stream.stop()
+        if self.hub is not None:
+            self.hub.close()  # Attached instances elect a new hub
+        if self.hub_client is not None:
+            self.hub_client.close()
+        if self.replay is not None:
+            self.replay.stop()
+        self.price_worker.shutdown()
+        self.save_snapshot()
+        self.save_config()
+        self.config_store.close()  # Write pending changes before exit
+        if self.recorder is not None:
+            self.recorder.close()
+        super().closeEvent(event)
+
     def isAlwaysOnTop(self) -> bool:
         """Return whether the current window is always on top"""
+        import win32gui # type: ignore
+        import win32con # type: ignore
         hwnd = self.winId().__int__()
         return win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE) & win32con.WS_EX_TOPMOST != 0
 
@@ -367,11 +773,20 @@ class BTCPriceWidget(QWidget):
     def resize_window(self, width: int, height: int) -> None:
         """Resize window"""
         self.window_size = {'width': width, 'height': height}
-        self.setFixedSize(width, height)
+        self._apply_window_size()
         self.save_config()
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
-    widget = BTCPriceWidget()
+    parser = argparse.ArgumentParser(description='Desktop coin price widget')
+    parser.add_argument('--record', metavar='PATH', help='append every received price to a tick recording')
+    parser.add_argument('--replay', metavar='PATH', help='play a tick recording back instead of fetching')
+    parser.add_argument('--speed', type=float, default=1.0, help='replay speed (1 = real time, 0 = unpaced)')
+    parser.add_argument('--profile-startup', action='store_true', help='print time spent in each startup phase')
+    args, qt_args = parser.parse_known_args()
+    profile.verbose = args.profile_startup
+    app = QApplication(sys.argv[:1] + qt_args)
+    profile.mark('qapplication')
+    widget = BTCPriceWidget(args.record, args.replay, args.speed)
     widget.show()
+    profile.mark('show')
     sys.exit(app.exec_())
\ No newline at end of file
@@ -0,0 +1,80 @@
+import threading
+import time
+from metrics import metrics
+
+# Constants
+FAILURE_THRESHOLD = 3  # Consecutive failures that open a circuit
+COOLDOWN = 15.0  # seconds an open circuit refuses calls before letting one probe through
+MAX_COOLDOWN = 300.0  # seconds, longest cooldown after repeated failed probes
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'  # One probe is out; everything else is still refused
+
+
+class CircuitBreaker:
+    """Stops calling a failing endpoint or provider for a cooldown, then probes it with a single call
+
+    Closed: calls pass and consecutive failures are counted. Open: calls are refused until the
+    cooldown ends. Half-open: the first caller is the probe; its success closes the circuit, its
+    failure reopens it with a doubled cooldown. A probe that never reports is replaced after a cooldown.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = FAILURE_THRESHOLD, cooldown: float = COOLDOWN,
+                 max_cooldown: float = MAX_COOLDOWN) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = CLOSED
+        self.failures = 0  # Consecutive
+        self.current_cooldown = cooldown
+        self.retry_at = 0.0  # monotonic time of the next probe
+        self._lock = threading.Lock()
+
+    def allow(self, now: float = None) -> bool:
+        """Return whether a call may go out now (in the half-open state, only for the probe)"""
+        if self.state == CLOSED:  # Fast path, no lock for the common case
+            return True
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if now < self.retry_at:
+                return False
+            self.state = HALF_OPEN
+            self.retry_at = now + self.current_cooldown  # Until the probe reports
+            return True
+
+    def retry_in(self, now: float = None) -> float:
+        """Return seconds until the next probe (0 while closed)"""
+        if self.state == CLOSED:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        return max(0.0, self.retry_at - now)
+
+    def record_success(self) -> None:
+        """Close the circuit"""
+        if self.state == CLOSED and not self.failures:
+            return
+        with self._lock:
+            if self.state != CLOSED:
+                print(f"Circuit closed: {self.name} recovered")
+                metrics.set_gauge('circuit_open', 0, circuit=self.name)
+            self.state = CLOSED
+            self.failures = 0
+            self.current_cooldown = self.cooldown
+
+    def record_failure(self, now: float = None) -> None:
+        """Count a failure; opens the circuit at the threshold or when the probe failed"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN:
+                self.current_cooldown = min(self.current_cooldown * 2, self.max_cooldown)
+            elif self.state == OPEN or self.failures < self.failure_threshold:
+                return  # Calls that were already out when the circuit opened do not extend it
+            self.state = OPEN
+            self.retry_at = now + self.current_cooldown
+        print(f"Circuit open: {self.name} failed {self.failures} times, probing in {self.current_cooldown:.0f}s")
+        metrics.inc('circuit_opened_total', circuit=self.name)
+        metrics.set_gauge('circuit_open', 1, circuit=self.name)
@@ -0,0 +1,71 @@
+from typing import Dict, List, Set
+import bisect
+
+# Constants
+MAX_RESULTS = 200  # Rows shown in the coin selector for a query
+
+
+class SymbolIndex:
+    """Prebuilt prefix and trigram index over the symbol list"""
+
+    def __init__(self, symbols: List[str] = None) -> None:
+        self.symbols: List[str] = []
+        self._sorted: List[str] = []  # Lower-case symbols for prefix lookups
+        self._by_lower: Dict[str, List[str]] = {}
+        self._trigrams: Dict[str, Set[int]] = {}
+        self._positions: Dict[str, int] = {}  # Symbol -> original list position (tie-breaker)
+        if symbols:
+            self.build(symbols)
+
+    def build(self, symbols: List[str]) -> None:
+        """Index symbols (called once per symbol list change)"""
+        self.symbols = list(symbols)
+        self._positions = {symbol: position for position, symbol in enumerate(self.symbols)}
+        self._by_lower = {}
+        self._trigrams = {}
+        for position, symbol in enumerate(self.symbols):
+            lower = symbol.lower()
+            self._by_lower.setdefault(lower, []).append(symbol)
+            for start in range(len(lower) - 2):
+                self._trigrams.setdefault(lower[start:start + 3], set()).add(position)
+        self._sorted = sorted(self._by_lower)
+
+    def search(self, text: str, limit: int = MAX_RESULTS) -> List[str]:
+        """Return symbols containing text, ranked exact > prefix > substring"""
+        query = text.strip().lower()
+        if not query:
+            return list(self.symbols)  # Empty search lists everything
+
+        exact = self._by_lower.get(query, [])
+        prefix = [symbol for symbol in self._prefix_matches(query) if symbol not in exact]
+        seen = set(exact) | set(prefix)
+        substring = [symbol for symbol in self._substring_matches(query) if symbol not in seen]
+        # Shorter symbols first within a rank, then original order
+        prefix.sort(key=lambda symbol: (len(symbol), self._positions[symbol]))
+        substring.sort(key=lambda symbol: (symbol.lower().find(query), len(symbol), self._positions[symbol]))
+        return (exact + prefix + substring)[:limit]
+
+    def _prefix_matches(self, query: str) -> List[str]:
+        """Binary search the sorted symbols for query as a prefix"""
+        start = bisect.bisect_left(self._sorted, query)
+        end = bisect.bisect_left(self._sorted, query + '￿')
+        matches = []
+        for lower in self._sorted[start:end]:
+            matches.extend(self._by_lower[lower])
+        return matches
+
+    def _substring_matches(self, query: str) -> List[str]:
+        """Intersect trigram posting lists, then verify the candidates"""
+        if len(query) < 3:
+            candidates = range(len(self.symbols))  # Too short for trigrams, scan
+        else:
+            postings = []
+            for start in range(len(query) - 2):
+                posting = self._trigrams.get(query[start:start + 3])
+                if not posting:
+                    return []
+                postings.append(posting)
+            postings.sort(key=len)
+            candidates = set.intersection(*postings)
+        return [self.symbols[position] for position in candidates
+                if query in self.symbols[position].lower()]
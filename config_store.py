@@ -0,0 +1,196 @@
+from typing import Any, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import json
+import os
+from PyQt5.QtCore import QObject, QTimer
+from atomic_file import write_atomic
+
+# Constants
+CONFIG_FILE = 'config.json'
+BACKUP_SUFFIX = '.bak'  # Previous good copy, used when the main file is unreadable
+CORRUPT_SUFFIX = '.corrupt'  # An unreadable main file is moved here so the next save cannot destroy it
+SAVE_DELAY = 500  # ms, rapid changes within this window are written once
+DEFAULT_CONFIG = {
+    'selected_coins': [],
+    'opacity': 100,
+    'always_on_top': 0,
+    'language': 'kr',
+    'window_size': {'width': 270, 'height': 300}
+}
+
+
+def _is_number(value) -> bool:
+    """Return whether value is an int or float (bool excluded)"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_position(position) -> bool:
+    """Return whether a legacy coin_data entry holds a numeric entry_price and current_holding"""
+    return isinstance(position, dict) and all(_is_number(position.get(key))
+                                              for key in ('entry_price', 'current_holding'))
+
+
+def _is_lot(lot) -> bool:
+    """Return whether a portfolio lot has a numeric quantity and price"""
+    return isinstance(lot, dict) and _is_number(lot.get('quantity')) and _is_number(lot.get('price'))
+
+
+def validate_config(data) -> dict:
+    """Check the known fields and fill missing ones with defaults; raises ValueError
+
+    A bad entry inside coin_data, portfolio lots or alerts is dropped on its own instead of
+    rejecting the file, so one incomplete position never costs the watchlist.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("config is not an object")
+    coins = data.get('selected_coins', [])
+    if not isinstance(coins, list) or not all(isinstance(coin, str) for coin in coins):
+        raise ValueError("selected_coins must be a list of symbols")
+    if not _is_number(data.get('opacity', 100)) or not 0 <= data.get('opacity', 100) <= 100:
+        raise ValueError("opacity must be 0-100")
+    if not isinstance(data.get('always_on_top', 0), (int, bool)):
+        raise ValueError("always_on_top must be 0 or 1")
+    if not isinstance(data.get('language', 'kr'), str):
+        raise ValueError("language must be a string")
+    size = data.get('window_size', DEFAULT_CONFIG['window_size'])
+    if not isinstance(size, dict) or not all(_is_number(size.get(key)) and size[key] > 0
+                                             for key in ('width', 'height')):
+        raise ValueError("window_size needs positive width and height")
+    coin_data = data.get('coin_data', {})
+    if not isinstance(coin_data, dict):
+        raise ValueError("coin_data must be an object")
+    portfolio = data.get('portfolio', {})
+    if not isinstance(portfolio, dict) or not isinstance(portfolio.get('lots', {}), dict):
+        raise ValueError("portfolio must be an object with a lots object")
+    alerts = data.get('alerts', [])
+    if not isinstance(alerts, list):
+        raise ValueError("alerts must be a list")
+
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    config.update(data)
+    if 'coin_data' in data:
+        # Entries without both numbers never produced a profit; they carry no position
+        config['coin_data'] = {symbol: position for symbol, position in coin_data.items() if _is_position(position)}
+        for symbol in set(coin_data) - set(config['coin_data']):
+            print(f"Config: ignoring incomplete coin_data entry {symbol}")
+    if 'lots' in portfolio:
+        lots = {}
+        for symbol, entries in portfolio['lots'].items():
+            valid = [lot for lot in entries if _is_lot(lot)] if isinstance(entries, list) else []
+            if len(valid) != (len(entries) if isinstance(entries, list) else -1):
+                print(f"Config: ignoring invalid portfolio lots of {symbol}")
+            if valid:
+                lots[symbol] = valid
+        config['portfolio'] = dict(portfolio, lots=lots)
+    if 'alerts' in data:
+        config['alerts'] = [alert for alert in alerts
+                            if isinstance(alert, dict) and isinstance(alert.get('symbol'), str)]
+        if len(config['alerts']) != len(alerts):
+            print(f"Config: ignoring {len(alerts) - len(config['alerts'])} alert(s) without a symbol")
+    return config
+
+
+def read_config(path: str) -> dict:
+    """Read and validate one config file"""
+    with open(path, 'r') as f:
+        return validate_config(json.load(f))
+
+
+def load_config(path: str = CONFIG_FILE) -> Tuple[dict, Optional[str]]:
+    """Load the config, falling back to the previous good copy and then to defaults
+
+    Returns the config and the file it came from (None for defaults).
+    An unreadable main file is moved to CORRUPT_SUFFIX first, so saving the fallback never replaces it.
+    """
+    for candidate in (path, path + BACKUP_SUFFIX):
+        try:
+            return read_config(candidate), candidate
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError) as e:  # json.JSONDecodeError is a ValueError
+            print(f"Config load error ({candidate}): {e}")
+            if candidate == path:
+                try:
+                    os.replace(path, path + CORRUPT_SUFFIX)
+                    print(f"Config: kept the unreadable file as {path + CORRUPT_SUFFIX}")
+                except OSError as move_error:
+                    print(f"Config load error: cannot move {path} aside: {move_error}")
+    return copy.deepcopy(DEFAULT_CONFIG), None
+
+
+def write_config(content: str, path: str = CONFIG_FILE) -> None:
+    """Atomically replace path with content, keeping the old file as the backup"""
+    # Rotate only a valid file into the backup so a corrupt one never replaces the last good copy
+    try:
+        read_config(path)
+        backup = path + BACKUP_SUFFIX
+    except (OSError, ValueError):
+        backup = None
+    write_atomic(content, path, backup)
+
+
+class ConfigStore(QObject):
+    """In-memory config with dirty tracking and debounced, atomic writes off the GUI thread"""
+
+    def __init__(self, path: str = CONFIG_FILE, delay: int = SAVE_DELAY, parent=None) -> None:
+        super().__init__(parent)
+        self.path = path
+        self.data, self.loaded_from = load_config(path)  # loaded_from is None when defaults were used
+        self._saved = copy.deepcopy(self.data)  # What is on disk, to detect real changes
+        self._dirty: Set[str] = set()
+        self._executor = ThreadPoolExecutor(max_workers=1)  # Keeps writes in order
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)
+        self._timer.timeout.connect(self.flush)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a config value"""
+        return self.data.get(key, default)
+
+    def update(self, **fields) -> None:
+        """Set fields and schedule a write if any of them differs from what is on disk"""
+        for key, value in fields.items():
+            self.data[key] = value
+            if value != self._saved.get(key):
+                self._dirty.add(key)
+            else:
+                self._dirty.discard(key)
+        if self._dirty:
+            self._timer.start()  # Restarting coalesces bursts (e.g. slider drags) into one write
+
+    def remove(self, *keys: str) -> None:
+        """Drop fields and schedule a write if any of them was on disk"""
+        for key in keys:
+            self.data.pop(key, None)
+            if key in self._saved:
+                self._dirty.add(key)
+        if self._dirty:
+            self._timer.start()
+
+    def is_dirty(self) -> bool:
+        """Return whether unsaved changes exist"""
+        return bool(self._dirty)
+
+    def flush(self) -> None:
+        """Write pending changes now (the file write runs on the writer thread)"""
+        self._timer.stop()
+        if not self._dirty:
+            return
+        content = json.dumps(self.data, indent=4)  # Serialized here so the writer sees a consistent copy
+        self._saved = json.loads(content)
+        self._dirty.clear()
+        self._executor.submit(self._write, content)
+
+    def close(self) -> None:
+        """Flush and wait for pending writes"""
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def _write(self, content: str) -> None:
+        """Write the serialized config (runs on the writer thread)"""
+        try:
+            write_config(content, self.path)
+        except OSError as e:
+            print(f"Config save error: {e}")
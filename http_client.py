@@ -0,0 +1,208 @@
+from typing import Dict, Optional, TYPE_CHECKING
+from urllib.parse import urlsplit
+import random
+import threading
+import time
+from circuit_breaker import CircuitBreaker
+from metrics import metrics
+
+if TYPE_CHECKING:
+    import requests
+
+# Constants
+CONNECT_TIMEOUT = 3.05  # seconds
+READ_TIMEOUT = 10  # seconds
+MAX_RETRIES = 3
+CALL_BUDGET = 12.0  # seconds one get() may spend on attempts and backoff together
+BACKOFF_BASE = 0.5  # seconds, doubled per attempt
+BACKOFF_MAX = 8.0  # seconds, longest wait before a retry
+POOL_HOSTS = 4  # Number of per-host connection pools kept alive
+POOL_SIZE = 8  # Connections per host
+RETRY_STATUS = {500, 502, 503, 504}
+RATE_LIMIT_STATUS = {418, 429}  # 429: slow down, 418: IP banned by Binance
+WEIGHT_HEADER = 'X-MBX-USED-WEIGHT-1M'  # Binance request weight used in the current minute
+
+
+class HttpError(Exception):
+    """Raised when a request fails (the requests exception is chained as __cause__)"""
+
+    def __init__(self, message: str, status: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status = status  # HTTP status of the failed response, None without one
+
+
+class RateLimitedError(HttpError):
+    """Raised while a host has asked us to back off"""
+
+
+class CircuitOpenError(HttpError):
+    """Raised while an endpoint's circuit is open after repeated failures"""
+
+
+def is_client_error(error: Exception) -> bool:
+    """Return whether error is a rejected request (4xx other than rate limiting) rather than an outage"""
+    status = getattr(error, 'status', None)
+    return status is not None and 400 <= status < 500 and status not in RATE_LIMIT_STATUS
+
+
+class HttpClient:
+    """Shared HTTP session with keep-alive pools, timeouts and retry/backoff"""
+
+    def __init__(self, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), max_retries: int = MAX_RETRIES) -> None:
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._session = None  # Created by the first request, so importing requests stays off the startup path
+        self._blocked_until: Dict[str, float] = {}  # host -> monotonic time set by Retry-After
+        self._breakers: Dict[str, CircuitBreaker] = {}  # endpoint (host + path) -> circuit
+        self._lock = threading.Lock()
+        self.used_weight = 0  # Last WEIGHT_HEADER value seen on any response
+        self.weight_time = 0.0  # Wall-clock time of the response that reported used_weight
+
+    @property
+    def session(self) -> 'requests.Session':
+        """Return the pooled session, creating it on first use (usually on a fetch thread)"""
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_SIZE, max_retries=0)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._session = session
+            return self._session
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        """Return the circuit of an endpoint (host + path)"""
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = self._breakers[endpoint] = CircuitBreaker(endpoint)
+            return breaker
+
+    def get(self, url: str, **kwargs) -> 'requests.Response':
+        """GET url with retries; raises HttpError on failure and CircuitOpenError while the endpoint is down"""
+        session = self.session
+        import requests  # Already loaded by the session
+        parts = urlsplit(url)
+        endpoint = parts.netloc + parts.path
+        breaker = self.breaker(endpoint)
+        if not breaker.allow():
+            metrics.inc('http_errors_total', endpoint=endpoint, reason='circuit_open')
+            raise CircuitOpenError(f"{endpoint} is failing, retry in {breaker.retry_in():.0f}s")
+        try:
+            response = self._get(session, url, **kwargs)
+        except requests.RequestException as e:
+            response = getattr(e, 'response', None)
+            error = HttpError(str(e), response.status_code if response is not None else None)
+            if is_client_error(error):
+                breaker.record_success()  # The endpoint answered; the request itself was rejected
+            else:
+                breaker.record_failure()
+            raise error from e
+        breaker.record_success()
+        return response
+
+    def _get(self, session: 'requests.Session', url: str, **kwargs) -> 'requests.Response':
+        """GET url with retries; raises requests.RequestException on failure"""
+        import requests
+        parts = urlsplit(url)
+        host = parts.netloc
+        endpoint = host + parts.path
+        kwargs.setdefault('timeout', self.timeout)
+        deadline = time.monotonic() + CALL_BUDGET
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._check_blocked(host)
+            except RateLimitedError:
+                metrics.inc('http_errors_total', endpoint=endpoint, reason='blocked')
+                raise
+            last_attempt = attempt == self.max_retries
+            started = time.perf_counter()
+            try:
+                response = session.get(url, **kwargs)
+            except requests.ReadTimeout as e:
+                # The host took the request and went silent; another READ_TIMEOUT would only stall the caller
+                metrics.inc('http_errors_total', endpoint=endpoint, reason=type(e).__name__)
+                raise
+            except (requests.ConnectionError, requests.Timeout) as e:
+                metrics.inc('http_errors_total', endpoint=endpoint, reason=type(e).__name__)
+                delay = self._backoff(attempt)
+                if last_attempt or not self._fits(deadline, delay):
+                    raise
+                time.sleep(delay)
+                continue
+            metrics.observe('http_request_seconds', time.perf_counter() - started, endpoint=endpoint)
+            self._record_weight(response)
+            if response.status_code >= 400:
+                metrics.inc('http_errors_total', endpoint=endpoint, reason=str(response.status_code))
+
+            if response.status_code in RATE_LIMIT_STATUS:
+                retry_after = self._retry_after(response)
+                delay = retry_after if retry_after is not None else self._backoff(attempt)
+                # Waits longer than our backoff window (or an IP ban) block the host instead of sleeping
+                if (response.status_code == 418 or delay > BACKOFF_MAX or last_attempt
+                        or not self._fits(deadline, delay)):
+                    self._block(host, delay)
+                    response.raise_for_status()
+                time.sleep(delay)
+                continue
+
+            if response.status_code in RETRY_STATUS and not last_attempt:
+                delay = self._backoff(attempt)
+                if self._fits(deadline, delay):
+                    time.sleep(delay)
+                    continue
+
+            response.raise_for_status()
+            return response
+
+        raise requests.RequestException(f"Retries exhausted for {url}")  # Not reached
+
+    def get_json(self, url: str, **kwargs):
+        """GET url and decode the JSON body"""
+        response = self.get(url, **kwargs)
+        parts = urlsplit(url)
+        with metrics.timer('http_json_parse_seconds', endpoint=parts.netloc + parts.path):
+            return response.json()
+
+    def _fits(self, deadline: float, delay: float) -> bool:
+        """Return whether a retry after delay can still connect within the call budget"""
+        return time.monotonic() + delay + CONNECT_TIMEOUT < deadline
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+    def _retry_after(self, response: 'requests.Response') -> Optional[float]:
+        """Parse the Retry-After header in seconds"""
+        try:
+            return max(0.0, float(response.headers['Retry-After']))
+        except (KeyError, ValueError):
+            return None
+
+    def _record_weight(self, response: 'requests.Response') -> None:
+        """Remember the request weight Binance reports for this minute"""
+        try:
+            self.used_weight = int(response.headers[WEIGHT_HEADER])
+        except (KeyError, ValueError):
+            return
+        self.weight_time = time.time()
+        metrics.set_gauge('binance_used_weight', self.used_weight)
+
+    def _block(self, host: str, delay: float) -> None:
+        """Refuse requests to host for delay seconds"""
+        with self._lock:
+            self._blocked_until[host] = time.monotonic() + delay
+
+    def _check_blocked(self, host: str) -> None:
+        """Raise RateLimitedError while host is backing us off"""
+        with self._lock:
+            remaining = self._blocked_until.get(host, 0) - time.monotonic()
+        if remaining > 0:
+            raise RateLimitedError(f"{host} rate limited, retry in {remaining:.0f}s")
+
+
+# Shared client used by every price source
+client = HttpClient()
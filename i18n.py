@@ -0,0 +1,38 @@
+from typing import Dict, Optional
+import json
+
+# Constants
+LANGUAGE_FILE = 'language.json'
+DEFAULT_LANGUAGE = 'kr'
+
+
+class Catalog:
+    """Texts of every language, parsed from the language file once and shared by all windows"""
+
+    def __init__(self, path: str = LANGUAGE_FILE) -> None:
+        self.path = path
+        self._languages: Optional[Dict[str, Dict[str, str]]] = None
+
+    @property
+    def languages(self) -> Dict[str, Dict[str, str]]:
+        """Return language -> key -> text, loading the file on first use"""
+        if self._languages is None:
+            self._languages = self._load()
+        return self._languages
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        """Parse the language file"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Error loading language file: {e}")
+            return {}
+
+    def text(self, language: str, key: str) -> str:
+        """Return the text of key in language, or the key itself when it is missing"""
+        return self.languages.get(language, {}).get(key, key)
+
+
+# Shared catalog used by the widget and its dialogs
+catalog = Catalog()
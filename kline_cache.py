@@ -0,0 +1,176 @@
+from typing import Dict, List, Optional, Tuple
+from array import array
+import bisect
+import os
+import struct
+import threading
+import time
+from PyQt5.QtCore import QObject, pyqtSignal, Qt
+from providers import PriceSource, FETCH_ERRORS, KLINE_LIMIT
+from atomic_file import write_atomic
+
+# Constants
+KLINE_CACHE_DIR = 'kline_cache'
+MAGIC = b'KLINES01'  # File header, also the format version
+FIELDS = 6  # open time (ms), open, high, low, close, volume
+RECORD = struct.Struct(f'<{FIELDS}d')
+MAX_CANDLES = 1000  # Candles kept per symbol and interval
+TIME, OPEN, HIGH, LOW, CLOSE, VOLUME = range(FIELDS)
+INTERVAL_SECONDS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800, 'M': 2592000}  # Binance interval units
+
+
+def interval_seconds(interval: str) -> float:
+    """Return the length of a Binance interval such as '15m' or '4h'"""
+    return int(interval[:-1]) * INTERVAL_SECONDS[interval[-1]]
+
+
+class KlineSeries:
+    """Candles of one symbol and interval, stored flat in one double array (FIELDS values per candle)"""
+
+    __slots__ = ('values',)
+
+    def __init__(self, values: array = None) -> None:
+        self.values = values if values is not None else array('d')
+
+    def __len__(self) -> int:
+        return len(self.values) // FIELDS
+
+    def field(self, index: int, field: int) -> float:
+        return self.values[index * FIELDS + field]
+
+    def last_time(self) -> Optional[float]:
+        """Return the open time of the newest candle"""
+        return self.field(len(self) - 1, TIME) if len(self) else None
+
+    def merge(self, candles: List[Tuple[float, ...]], limit: int = MAX_CANDLES) -> None:
+        """Replace candles from the first new open time on (the newest cached one is usually still forming)"""
+        if not candles:
+            return
+        times = self.values[TIME::FIELDS]
+        keep = bisect.bisect_left(times, candles[0][TIME])
+        del self.values[keep * FIELDS:]
+        for candle in candles:
+            self.values.extend(candle[:FIELDS])
+        excess = len(self) - limit
+        if excess > 0:
+            del self.values[:excess * FIELDS]
+
+
+def kline_path(symbol: str, interval: str, directory: str = KLINE_CACHE_DIR) -> str:
+    """Return the cache file of symbol and interval"""
+    return os.path.join(directory, f'{symbol}_{interval}.bin')
+
+
+def read_klines(path: str) -> KlineSeries:
+    """Load a cache file (empty when missing or unreadable)"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return KlineSeries()
+    except OSError as e:
+        print(f"Kline cache load error: {e}")
+        return KlineSeries()
+    if not data.startswith(MAGIC):
+        print(f"Kline cache load error: {path} is not a kline cache")
+        return KlineSeries()
+    body = data[len(MAGIC):]
+    values = array('d')
+    values.frombytes(body[:len(body) - len(body) % RECORD.size])  # A torn last record is dropped
+    return KlineSeries(values)
+
+
+def write_klines(path: str, series: KlineSeries) -> None:
+    """Write a cache file atomically"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    write_atomic(MAGIC + series.values.tobytes(), path)
+
+
+def downsample_candles(series: KlineSeries, count: int) -> List[Tuple[float, float, float, float]]:
+    """Merge the newest candles into at most count (open, high, low, close) buckets
+
+    Merged buckets keep the first open, the highest high, the lowest low and the last close, so a
+    spike survives downsampling (point pickers such as LTTB would drop it from a candle chart).
+    """
+    total = len(series)
+    if not total or count <= 0:
+        return []
+    values = series.values
+    size = max(1, -(-total // count))  # Candles per bucket, rounded up
+    buckets = []
+    for last in range(total - 1, -1, -size):  # Aligned to the newest candle
+        first = max(0, last - size + 1)
+        highs = values[first * FIELDS + HIGH:(last + 1) * FIELDS:FIELDS]
+        lows = values[first * FIELDS + LOW:(last + 1) * FIELDS:FIELDS]
+        buckets.append((values[first * FIELDS + OPEN], max(highs), min(lows), values[last * FIELDS + CLOSE]))
+    buckets.reverse()
+    return buckets
+
+
+class KlineLoader(QObject):
+    """Loads candles from the disk cache and fetches only the missing tail, off the GUI thread"""
+
+    klines_ready = pyqtSignal(str, str, object)  # symbol, interval, KlineSeries
+    _fetched = pyqtSignal(str, str, object, bool)  # ..., whether the refresh is finished
+
+    def __init__(self, parent=None, directory: str = KLINE_CACHE_DIR) -> None:
+        super().__init__(parent)
+        self.directory = directory
+        self.series: Dict[Tuple[str, str], KlineSeries] = {}  # Loaded this session
+        self._busy = set()
+        self._fetched.connect(self._on_fetched, Qt.QueuedConnection)
+
+    def request(self, source: PriceSource, symbol: str, interval: str) -> None:
+        """Emit cached candles right away (if loaded), then refresh them in the background"""
+        key = (symbol, interval)
+        if key in self.series:
+            self.klines_ready.emit(symbol, interval, self.series[key])
+        if key in self._busy:
+            return
+        self._busy.add(key)
+        threading.Thread(target=self._run, args=(source, symbol, interval), daemon=True).start()
+
+    def _run(self, source: PriceSource, symbol: str, interval: str) -> None:
+        """Refresh one series (runs on a worker thread); the busy flag is released whatever happens"""
+        series = None
+        try:
+            series = self._refresh(source, symbol, interval)
+        except Exception as e:
+            print(f"Kline refresh error for {symbol}: {e}")
+        finally:
+            self._fetched.emit(symbol, interval, series, True)
+
+    def _refresh(self, source: PriceSource, symbol: str, interval: str) -> KlineSeries:
+        """Read the cache once per session and fetch the tail"""
+        path = kline_path(symbol, interval, self.directory)
+        series = self.series.get((symbol, interval))
+        if series is None:
+            series = read_klines(path)
+            if len(series):
+                self._fetched.emit(symbol, interval, series, False)  # Paint the cached candles before the fetch
+        start = series.last_time()
+        if start is not None and (time.time() - start / 1000) / interval_seconds(interval) > KLINE_LIMIT:
+            start = None  # One request cannot close the gap: fetch the latest candles instead
+        try:
+            candles = source.klines(symbol, interval, start)
+        except FETCH_ERRORS as e:
+            print(f"Failed to fetch klines for {symbol}: {e}")
+            candles = None
+        if candles:
+            # A copy, since the GUI thread may be painting the old series
+            series = KlineSeries(array('d', series.values) if start is not None else None)
+            series.merge(candles)
+            try:
+                write_klines(path, series)
+            except OSError as e:
+                print(f"Kline cache save error: {e}")
+        return series
+
+    def _on_fetched(self, symbol: str, interval: str, series: KlineSeries, done: bool) -> None:
+        """Publish results on the GUI thread"""
+        if done:
+            self._busy.discard((symbol, interval))
+        if series is None:
+            return  # The refresh failed; keep what was shown
+        self.series[(symbol, interval)] = series
+        self.klines_ready.emit(symbol, interval, series)
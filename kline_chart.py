@@ -0,0 +1,92 @@
+from typing import List, Optional, Tuple
+from PyQt5.QtCore import QRectF, Qt
+from PyQt5.QtGui import QColor, QFont, QPainter, QPen
+from PyQt5.QtWidgets import QWidget
+from kline_cache import KlineSeries, downsample_candles
+from price_model import PROFIT_COLOR, LOSS_COLOR, STALE_COLOR, format_price
+
+# Constants
+CHART_HEIGHT = 120  # px the window grows by while the chart is shown
+CANDLE_SPACING = 4  # px per candle: 3 px body and 1 px gap
+CHART_MARGIN = 4  # px
+LABEL_HEIGHT = 14  # px reserved above the candles for symbol and price
+
+# Cached colours
+BACKGROUND_COLOR = QColor("#181C21")
+BORDER_COLOR = QColor("#2B3139")
+
+
+class KlineChart(QWidget):
+    """Candlestick chart of one symbol, downsampled to one candle per CANDLE_SPACING pixels"""
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.setFixedHeight(CHART_HEIGHT)
+        self.symbol: Optional[str] = None
+        self.interval = ''
+        self.series: Optional[KlineSeries] = None
+        self._candles: Optional[List[Tuple[float, float, float, float]]] = None  # Downsampled for the width
+        self._pens = {color.rgb(): QPen(color, 1) for color in (PROFIT_COLOR, LOSS_COLOR)}
+        self._label_font = QFont(self.font())
+        self._label_font.setPointSizeF(max(6.0, self.font().pointSizeF() - 2))
+
+    def set_symbol(self, symbol: str, interval: str) -> None:
+        """Show symbol; candles stay empty until set_series delivers them"""
+        if (symbol, interval) != (self.symbol, self.interval):
+            self.symbol = symbol
+            self.interval = interval
+            self.series = None
+            self._candles = None
+            self.update()
+
+    def set_series(self, symbol: str, interval: str, series: KlineSeries) -> None:
+        """Replace the candles if they belong to the shown symbol"""
+        if (symbol, interval) != (self.symbol, self.interval) or series is self.series:
+            return
+        self.series = series
+        self._candles = None
+        self.update()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self._candles = None  # The bucket count follows the width
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), BACKGROUND_COLOR)
+        painter.setPen(BORDER_COLOR)
+        painter.drawLine(0, 0, self.width(), 0)
+        if self.symbol is None:
+            return
+
+        area = QRectF(CHART_MARGIN, CHART_MARGIN + LABEL_HEIGHT,
+                      self.width() - 2 * CHART_MARGIN, self.height() - 2 * CHART_MARGIN - LABEL_HEIGHT)
+        if self._candles is None:
+            count = int(area.width()) // CANDLE_SPACING
+            self._candles = downsample_candles(self.series, count) if self.series is not None else []
+        candles = self._candles
+
+        painter.setFont(self._label_font)
+        painter.setPen(STALE_COLOR)
+        label_rect = QRectF(CHART_MARGIN, CHART_MARGIN, area.width(), LABEL_HEIGHT)
+        painter.drawText(label_rect, Qt.AlignLeft | Qt.AlignVCenter, f'{self.symbol}  {self.interval}')
+        if not candles:
+            return
+        low = min(candle[2] for candle in candles)
+        high = max(candle[1] for candle in candles)
+        painter.drawText(label_rect, Qt.AlignRight | Qt.AlignVCenter,
+                         f'{format_price(self.symbol, low)} - {format_price(self.symbol, high)}')
+
+        scale = area.height() / (high - low) if high > low else 0.0
+        bottom = area.bottom()
+        left = area.right() - len(candles) * CANDLE_SPACING  # Newest candle at the right edge
+        body_width = CANDLE_SPACING - 1
+        for position, (open_, high_, low_, close) in enumerate(candles):
+            color = PROFIT_COLOR if close >= open_ else LOSS_COLOR
+            x = left + position * CANDLE_SPACING
+            wick = x + body_width / 2
+            painter.setPen(self._pens[color.rgb()])
+            painter.drawLine(int(wick), int(bottom - (high_ - low) * scale), int(wick), int(bottom - (low_ - low) * scale))
+            top = bottom - (max(open_, close) - low) * scale
+            height = max(1.0, abs(close - open_) * scale)
+            painter.fillRect(QRectF(x, top, body_width, height), color)
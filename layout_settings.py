@@ -1,12 +1,20 @@
 from PyQt5.QtWidgets import (
     QVBoxLayout, QHBoxLayout, QComboBox, QPushButton, 
-    QLineEdit, QTableWidget, QTableWidgetItem, QSlider, 
+    QLineEdit, QTableWidget, QTableView, QSlider, 
     QCheckBox, QHeaderView, QDialog, QLabel, QWidget
 )
-from PyQt5.QtCore import Qt
-import json
+from PyQt5.QtCore import Qt, QTimer, QStringListModel, QSignalBlocker
+from PyQt5.QtGui import QPainter
+from price_model import FLASH_ROLE
+from metrics import metrics
+from i18n import catalog, DEFAULT_LANGUAGE
+import time
 from typing import Tuple
 
+SEARCH_DEBOUNCE = 150  # ms of typing pause before the coin list is filtered
+SPARKLINE_WIDTH = 64  # px
+COIN_SELECTOR_LENGTH = 12  # Characters the coin selector is sized for (instead of measuring every symbol)
+
 # Constants for styling
 WINDOW_STYLE = """
     QWidget {
@@ -16,16 +24,16 @@ WINDOW_STYLE = """
 """
 
 TABLE_STYLE = """
-    QTableWidget {
+    QTableView {
         background-color: #1E2329;
         border: none;
     }
-    QTableWidget::item {
+    QTableView::item {
         color: #EAECEF;
         border-bottom: 1px solid #2B3139;
         padding: 5px;
     }
-    QTableWidget::item:selected {
+    QTableView::item:selected {
         background-color: #363C45;
     }
 """
@@ -105,8 +113,18 @@ class SettingsDialog(QDialog):
         self.search_input = QLineEdit(self)
         self.search_input.setPlaceholderText('Search for coins...')
         
-        # Coin selector
+        # Coin selector: the widget's shared symbol model, or search results while a search is typed
         self.coin_selector = QComboBox(self)
+        self.coin_selector.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
+        self.coin_selector.setMinimumContentsLength(COIN_SELECTOR_LENGTH)
+        self.coin_selector.view().setUniformItemSizes(True)  # Popup rows are never measured one by one
+        self.search_model = QStringListModel(self)
+        
+        # Filter only after typing pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE)
+        self.search_timer.timeout.connect(self.filter_coins)
         
         # Add Coin button
         self.add_button = QPushButton(self.get_text('add_coin'), self)
@@ -136,7 +154,6 @@ class SettingsDialog(QDialog):
         width_label = QLabel("W:")  # Change Width label to W
         self.width_input = QLineEdit()
         self.width_input.setFixedWidth(60)  # Limit input field width
-        self.width_input.setText(str(btc_widget.window_size['width']))
         size_layout.addWidget(width_label)
         size_layout.addWidget(self.width_input)
         size_layout.addWidget(QLabel("px"))  # Add px text
@@ -145,7 +162,6 @@ class SettingsDialog(QDialog):
         height_label = QLabel("H:")  # Change Height label to H
         self.height_input = QLineEdit()
         self.height_input.setFixedWidth(60)  # Limit input field width
-        self.height_input.setText(str(btc_widget.window_size['height']))
         size_layout.addWidget(height_label)
         size_layout.addWidget(self.height_input)
         size_layout.addWidget(QLabel("px"))  # Add px text
@@ -168,7 +184,8 @@ class SettingsDialog(QDialog):
         
         # Event connections
         self.language_selector.currentIndexChanged.connect(self.change_language)
-        self.search_input.textChanged.connect(self.filter_coins)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        self.btc_widget.coin_model.modelReset.connect(self.filter_coins)  # New symbol list: re-rank the current query
         self.add_button.clicked.connect(self.add_coin)
         
         # Slider and checkbox event connections
@@ -180,12 +197,6 @@ class SettingsDialog(QDialog):
         
         # Load settings
         self.load_settings()
-        
-        # Reflect current language in the combo box
-        current_lang = self.btc_widget.config.get('language', 'kr')
-        index = self.language_selector.findData(current_lang)
-        if index >= 0:
-            self.language_selector.setCurrentIndex(index)
 
         self.setStyleSheet("""
             QDialog {
@@ -244,46 +255,68 @@ class SettingsDialog(QDialog):
         """)
 
     def load_settings(self):
-        """Load settings and reflect them in the UI"""
-        self.always_on_top_checkbox.setChecked(self.btc_widget.isAlwaysOnTop())
-        self.opacity_slider.setValue(int(self.btc_widget.windowOpacity() * 100))
+        """Reflect widget settings in the UI; only controls whose value changed are touched"""
+        widget = self.btc_widget
+        language = widget.config.get('language', DEFAULT_LANGUAGE)
+        if language != self.current_language:
+            self.current_language = language
+            self.update_texts()
+        # Signals stay blocked so reflecting a value does not apply (and save) it again
+        index = self.language_selector.findData(language)
+        if index >= 0 and index != self.language_selector.currentIndex():
+            with QSignalBlocker(self.language_selector):
+                self.language_selector.setCurrentIndex(index)
+        opacity = round(widget.windowOpacity() * 100)
+        if opacity != self.opacity_slider.value():
+            with QSignalBlocker(self.opacity_slider):
+                self.opacity_slider.setValue(opacity)
+        if widget.always_on_top != self.always_on_top_checkbox.isChecked():
+            with QSignalBlocker(self.always_on_top_checkbox):
+                self.always_on_top_checkbox.setChecked(widget.always_on_top)
+        for field, value in ((self.width_input, widget.window_size['width']),
+                             (self.height_input, widget.window_size['height'])):
+            if field.text() != str(value):
+                field.setText(str(value))
+        # A reopened dialog starts from the full list instead of the last search
+        if self.search_input.text():
+            with QSignalBlocker(self.search_input):
+                self.search_input.clear()
+            self.search_timer.stop()
+            self.filter_coins()
 
     def load_coins(self):
+        """Show the shared symbol model (built once by the widget, updated when the symbol list changes)"""
         if self.btc_widget:
-            self.coin_selector.clear()
-            for coin in self.btc_widget.coins:
-                self.coin_selector.addItem(coin[0])
+            self.filter_coins()
 
     def filter_coins(self):
-        search_text = self.search_input.text().lower()
-        self.coin_selector.clear()
-        filtered_coins = [coin[0] for coin in self.btc_widget.coins if search_text in coin[0].lower()]
-        self.coin_selector.addItems(filtered_coins)
+        """Show ranked matches from the prebuilt symbol index"""
+        text = self.search_input.text()
+        if text.strip():
+            self.search_model.setStringList(self.btc_widget.coin_index.search(text))
+            model = self.search_model
+        else:
+            model = self.btc_widget.coin_model  # Every symbol, without copying the list
+        if self.coin_selector.model() is not model:
+            self.coin_selector.setModel(model)
+        if model.rowCount():
+            self.coin_selector.setCurrentIndex(0)
 
     def add_coin(self):
         if self.btc_widget:
             selected_coin = self.coin_selector.currentText()
             if selected_coin and selected_coin not in self.btc_widget.selected_coins:
                 self.btc_widget.selected_coins.append(selected_coin)
-                self.btc_widget.update_price()
+                self.btc_widget.coins_changed()
 
     def load_language(self) -> None:
-        """Load language file"""
-        try:
-            with open('language.json', 'r', encoding='utf-8') as f:
-                self.languages = json.load(f)
-                self.current_language = self.btc_widget.config.get('language', 'kr')
-        except Exception as e:
-            print(f"Error loading language file: {e}")
-            self.languages = {}
-            self.current_language = 'kr'
+        """Use the shared language catalog (parsed once at startup)"""
+        self.languages = catalog.languages
+        self.current_language = self.btc_widget.config.get('language', DEFAULT_LANGUAGE)
 
     def get_text(self, key: str) -> str:
         """Return text based on current language"""
-        try:
-            return self.languages[self.current_language][key]
-        except:
-            return key
+        return catalog.text(self.current_language, key)
 
     def change_language(self):
         """Change language setting"""
@@ -292,7 +325,6 @@ class SettingsDialog(QDialog):
             print(f"Changing language to: {new_language}")  # For debugging
             self.current_language = new_language
             self.btc_widget.config['language'] = new_language
-            self.btc_widget.languages = self.languages  # Update main widget language data
             
             # Update UI texts
             self.update_texts()
@@ -397,10 +429,9 @@ def create_layout(widget):
 
     return layout, price_table, settings_button, None
 
-def setup_table(table: QTableWidget) -> None:
-    """Configure table widget settings"""
+def setup_table(table: QTableView) -> None:
+    """Configure table view settings (the model must already be set)"""
     # Basic table settings
-    table.setColumnCount(3) # Changed to 3 columns
     table.horizontalHeader().hide()
     table.verticalHeader().hide()
     
@@ -409,15 +440,17 @@ def setup_table(table: QTableWidget) -> None:
     
     # Table property settings
     table.setShowGrid(False)
-    table.setFrameShape(QTableWidget.NoFrame)
-    table.setSelectionBehavior(QTableWidget.SelectRows)
-    table.setSelectionMode(QTableWidget.SingleSelection)
-    table.setEditTriggers(QTableWidget.NoEditTriggers)
+    table.setFrameShape(QTableView.NoFrame)
+    table.setSelectionBehavior(QTableView.SelectRows)
+    table.setSelectionMode(QTableView.SingleSelection)
+    table.setEditTriggers(QTableView.NoEditTriggers)
     
     # Column width settings
     table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
     table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents) # Adjust as needed
     table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch) # New column for profit
+    table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Fixed) # Sparkline and % change
+    table.setColumnWidth(3, SPARKLINE_WIDTH)
 
 def create_title_bar(parent: QWidget) -> Tuple[QWidget, QPushButton, QPushButton]:
     """Create title bar with controls"""
@@ -449,6 +482,13 @@ def create_title_bar(parent: QWidget) -> Tuple[QWidget, QPushButton, QPushButton
     title_label.setObjectName("title_label")
     title_label.setStyleSheet("color: #EAECEF; font-weight: bold;")
     
+    # Debug overlay toggle (found by object name)
+    debug_button = QPushButton("i", title_bar)
+    debug_button.setObjectName("debug_button")
+    debug_button.setFixedSize(20, 30)
+    debug_button.setStyleSheet("font-size: 11px; color: #474D57;")
+    debug_button.setToolTip("Debug")
+    
     # Settings button
     settings_button = QPushButton("⚙", title_bar)
     settings_button.setFixedSize(30, 30)
@@ -461,7 +501,76 @@ def create_title_bar(parent: QWidget) -> Tuple[QWidget, QPushButton, QPushButton
     
     layout.addWidget(title_label)
     layout.addStretch()
+    layout.addWidget(debug_button)
     layout.addWidget(settings_button)
     layout.addWidget(close_button)
     
-    return title_bar, settings_button, close_button
\ No newline at end of file
+    return title_bar, settings_button, close_button
+
+def create_debug_overlay(parent: QWidget) -> QLabel:
+    """Create the hidden debug overlay label"""
+    overlay = QLabel(parent)
+    overlay.setObjectName("debug_overlay")
+    overlay.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+    overlay.setWordWrap(True)
+    overlay.setAttribute(Qt.WA_TransparentForMouseEvents)
+    overlay.setStyleSheet("""
+        QLabel {
+            background-color: rgba(30, 35, 41, 220);
+            color: #F0B90B;
+            font-family: Consolas, monospace;
+            font-size: 10px;
+            padding: 4px;
+        }
+    """)
+    overlay.hide()
+    return overlay
+
+def create_totals_table(parent: QWidget, model) -> QTableView:
+    """Create the one-row portfolio totals view pinned below the price table"""
+    table = QTableView(parent)
+    table.setModel(model)
+    setup_table(table)
+    table.setSelectionMode(QTableView.NoSelection)
+    table.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+    table.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+    table.setFixedHeight(table.verticalHeader().defaultSectionSize())
+    table.setStyleSheet(TABLE_STYLE + """
+    QTableView {
+        border-top: 1px solid #363C45;
+    }
+    QTableView::item {
+        border-bottom: none;
+        font-weight: bold;
+    }
+""")
+    return table
+
+class TimedTableView(QTableView):
+    """Table view that records its paint time and paints row flashes over the cells"""
+
+    def paintEvent(self, event):
+        started = time.perf_counter()
+        super().paintEvent(event)
+        self._paint_flashes()
+        metrics.observe('table_paint_seconds', time.perf_counter() - started)
+
+    def _paint_flashes(self) -> None:
+        """Overlay FLASH_ROLE colours (item style sheets would hide a BackgroundRole)"""
+        model = self.model()
+        if model is None or not model.rowCount():
+            return
+        viewport = self.viewport()
+        first = max(0, self.rowAt(0))
+        last = self.rowAt(viewport.height() - 1)
+        last = model.rowCount() - 1 if last < 0 else last
+        painter = None
+        for row in range(first, last + 1):
+            color = model.index(row, 0).data(FLASH_ROLE)
+            if color is None:
+                continue
+            if painter is None:
+                painter = QPainter(viewport)
+            painter.fillRect(0, self.rowViewportPosition(row), viewport.width(), self.rowHeight(row), color)
+        if painter is not None:
+            painter.end()
\ No newline at end of file
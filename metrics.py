@@ -0,0 +1,165 @@
+from typing import Dict, List, Tuple
+import bisect
+import json
+import threading
+import time
+from atomic_file import write_atomic
+
+# Constants
+LATENCY_BUCKETS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]  # seconds
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus style)"""
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: List[float] = LATENCY_BUCKETS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Add a sample"""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, share: float) -> float:
+        """Estimate a quantile as the upper bound of its bucket"""
+        if not self.count:
+            return 0.0
+        rank = share * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.bounds[index] if index < len(self.bounds) else float('inf')
+        return float('inf')
+
+
+class Metrics:
+    """Thread-safe registry of counters, gauges and histograms"""
+
+    def __init__(self) -> None:
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        self.gauges: Dict[str, Dict[Labels, float]] = {}
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, amount: float = 1, **labels) -> None:
+        """Increase a counter"""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        """Set a gauge"""
+        with self._lock:
+            self.gauges.setdefault(name, {})[tuple(sorted(labels.items()))] = value
+
+    def clear_gauge(self, name: str) -> None:
+        """Drop every series of a gauge"""
+        with self._lock:
+            self.gauges.pop(name, None)
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Add a histogram sample"""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def timer(self, name: str, **labels) -> 'Timer':
+        """Return a context manager that observes its duration into name"""
+        return Timer(self, name, labels)
+
+    def to_dict(self) -> dict:
+        """Return all series as JSON-friendly data"""
+        with self._lock:
+            return {
+                'time': time.time(),
+                'counters': {name: [dict(key, value=value) for key, value in series.items()]
+                             for name, series in self.counters.items()},
+                'gauges': {name: [dict(key, value=value) for key, value in series.items()]
+                           for name, series in self.gauges.items()},
+                'histograms': {name: [dict(key, count=h.count, sum=h.sum, p50=h.quantile(0.5),
+                                           p95=h.quantile(0.95), p99=h.quantile(0.99))
+                                      for key, h in series.items()]
+                               for name, series in self.histograms.items()},
+            }
+
+    def to_prometheus(self) -> str:
+        """Return all series in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                lines.append(f'# TYPE {name} counter')
+                lines.extend(f'{name}{format_labels(key)} {value}' for key, value in series.items())
+            for name, series in sorted(self.gauges.items()):
+                lines.append(f'# TYPE {name} gauge')
+                lines.extend(f'{name}{format_labels(key)} {value}' for key, value in series.items())
+            for name, series in sorted(self.histograms.items()):
+                lines.append(f'# TYPE {name} histogram')
+                for key, histogram in series.items():
+                    cumulative = 0
+                    for bound, count in zip(histogram.bounds + [float('inf')], histogram.counts):
+                        cumulative += count
+                        le = '+Inf' if bound == float('inf') else repr(bound)
+                        lines.append(f'{name}_bucket{format_labels(key + (("le", le),))} {cumulative}')
+                    lines.append(f'{name}_sum{format_labels(key)} {histogram.sum}')
+                    lines.append(f'{name}_count{format_labels(key)} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str, fmt: str = 'prometheus') -> None:
+        """Atomically write a JSON or Prometheus-text dump to path"""
+        if fmt == 'json':
+            content = json.dumps(self.to_dict(), indent=2)
+        else:
+            content = self.to_prometheus()
+        try:
+            write_atomic(content, path)
+        except OSError as e:
+            print(f"Metrics export error: {e}")
+
+
+class Timer:
+    """Context manager that records elapsed seconds into a histogram"""
+
+    __slots__ = ('metrics', 'name', 'labels', 'started')
+
+    def __init__(self, metrics: Metrics, name: str, labels: dict) -> None:
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+        self.started = 0.0
+
+    def __enter__(self) -> 'Timer':
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.metrics.observe(self.name, time.perf_counter() - self.started, **self.labels)
+
+
+def escape_label(value) -> str:
+    """Escape a label value for the text format"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels: Labels) -> str:
+    """Format labels as {key="value",...}"""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{escape_label(value)}"' for key, value in labels) + '}'
+
+
+# Shared registry for the whole app
+metrics = Metrics()
@@ -0,0 +1,261 @@
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from array import array
+from collections import deque
+import threading
+import time
+
+# Constants
+COST_METHODS = ('fifo', 'average')
+DEFAULT_METHOD = 'fifo'
+EPSILON = 1e-12  # Quantities below this count as a closed position
+
+
+class PortfolioTotals(NamedTuple):
+    """Whole-portfolio valuation at the last known prices"""
+    value: float  # Market value of open quantities
+    cost: float  # Cost basis of open quantities
+    unrealized: float
+    realized: float
+    priced: int  # Held symbols with a known price
+    held: int  # Held symbols
+
+
+class TradeColumns:
+    """Trades of one symbol stored column-wise (quantity > 0 buys, < 0 sells)"""
+
+    __slots__ = ('times', 'quantities', 'prices', 'fees')
+
+    def __init__(self) -> None:
+        self.times = array('d')
+        self.quantities = array('d')
+        self.prices = array('d')
+        self.fees = array('d')
+
+    def __len__(self) -> int:
+        return len(self.quantities)
+
+    def append(self, timestamp: float, quantity: float, price: float, fee: float) -> None:
+        self.times.append(timestamp)
+        self.quantities.append(quantity)
+        self.prices.append(price)
+        self.fees.append(fee)
+
+
+def cost_basis(trades: TradeColumns, method: str = DEFAULT_METHOD):
+    """Return (open quantity, open cost, realized P&L, oversold quantity) of trades in time order
+
+    The oversold quantity is what sells took beyond the open quantity; it is not counted anywhere.
+    """
+    order = sorted(range(len(trades)), key=trades.times.__getitem__)
+    realized = oversold = 0.0
+    if method == 'average':
+        quantity = cost = 0.0
+        for i in order:
+            amount, price, fee = trades.quantities[i], trades.prices[i], trades.fees[i]
+            if amount > 0:
+                quantity += amount
+                cost += amount * price + fee
+                continue
+            sold = min(-amount, max(quantity, 0.0))
+            oversold += -amount - sold
+            if sold > EPSILON:
+                average = cost / quantity
+                realized += sold * (price - average) - fee
+                quantity -= sold
+                cost -= sold * average
+        return quantity, cost, realized, oversold
+
+    # FIFO: sells consume the oldest open lots first
+    lots = deque()  # [quantity, unit cost]
+    for i in order:
+        amount, price, fee = trades.quantities[i], trades.prices[i], trades.fees[i]
+        if amount > 0:
+            lots.append([amount, price + fee / amount])
+            continue
+        remaining = -amount
+        realized -= fee
+        while remaining > EPSILON and lots:
+            lot = lots[0]
+            sold = min(remaining, lot[0])
+            realized += sold * (price - lot[1])
+            lot[0] -= sold
+            remaining -= sold
+            if lot[0] <= EPSILON:
+                lots.popleft()
+        oversold += max(remaining, 0.0)
+    quantity = sum(lot[0] for lot in lots)
+    cost = sum(lot[0] * lot[1] for lot in lots)
+    return quantity, cost, realized, oversold
+
+
+class Portfolio:
+    """Multi-lot positions with per-symbol aggregates kept in parallel columns for batched P&L"""
+
+    def __init__(self, method: str = DEFAULT_METHOD) -> None:
+        self.method = method if method in COST_METHODS else DEFAULT_METHOD
+        self.trades: Dict[str, TradeColumns] = {}
+        # Aggregate columns, one slot per symbol, rebuilt only when trades change
+        self.symbols: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.open_quantity = array('d')
+        self.open_cost = array('d')
+        self.realized = array('d')
+        self.prices = array('d')  # Last marked price, NaN until known
+        # Legacy coin_data positions lots cannot express (zero or short holdings): symbol -> (holding, entry price)
+        self.legacy: Dict[str, Tuple[float, float]] = {}
+        self.legacy_prices: Dict[str, float] = {}
+        self.oversold: Dict[str, float] = {}  # Sold quantity beyond the open quantity, per symbol
+        self._lock = threading.Lock()  # Ticks mark prices from the worker thread
+
+    def add_trade(self, symbol: str, quantity: float, price: float,
+                  timestamp: float = None, fee: float = 0.0, rebuild: bool = True) -> None:
+        """Record a buy (quantity > 0) or sell (quantity < 0); bulk loads pass rebuild=False and call rebuild()"""
+        with self._lock:
+            trades = self.trades.get(symbol)
+            if trades is None:
+                trades = self.trades[symbol] = TradeColumns()
+                self.index[symbol] = len(self.symbols)
+                self.symbols.append(symbol)
+                for column in (self.open_quantity, self.open_cost, self.realized):
+                    column.append(0.0)
+                self.prices.append(float('nan'))
+            trades.append(time.time() if timestamp is None else timestamp, quantity, price, fee)
+            if rebuild:
+                self._rebuild(symbol)
+
+    def rebuild(self) -> None:
+        """Recompute the aggregates of every symbol"""
+        with self._lock:
+            for symbol in self.symbols:
+                self._rebuild(symbol)
+
+    def _rebuild(self, symbol: str) -> None:
+        """Recompute the aggregates of one symbol"""
+        i = self.index[symbol]
+        quantity, cost, realized, oversold = cost_basis(self.trades[symbol], self.method)
+        self.open_quantity[i], self.open_cost[i], self.realized[i] = quantity, cost, realized
+        if oversold > EPSILON and self.oversold.get(symbol) != oversold:  # Reported once per change
+            print(f"Portfolio: {symbol} sells {oversold:g} more than it holds, the excess is ignored")
+        self.oversold[symbol] = oversold
+
+    def add_legacy(self, symbol: str, holding: float, entry_price: float) -> None:
+        """Keep a legacy coin_data position whose P&L is (price - entry_price) * holding"""
+        with self._lock:
+            self.legacy[symbol] = (holding, entry_price)
+
+    def holds(self, symbol: str) -> bool:
+        """Return whether symbol has an open quantity"""
+        i = self.index.get(symbol)
+        if i is None:
+            return bool(self.legacy.get(symbol, (0.0,))[0])
+        return self.open_quantity[i] > EPSILON
+
+    def held_symbols(self) -> Set[str]:
+        """Return symbols with an open quantity"""
+        held = {symbol for symbol, quantity in zip(self.symbols, self.open_quantity) if quantity > EPSILON}
+        return held | {symbol for symbol, (holding, _) in self.legacy.items() if holding}
+
+    def mark(self, prices: Dict[str, float]) -> Dict[str, float]:
+        """Store new prices and return unrealized P&L of the priced symbols we hold, in one pass"""
+        index = self.index
+        with self._lock:
+            hits = [(symbol, index[symbol], price) for symbol, price in prices.items() if symbol in index]
+            for _, i, price in hits:
+                self.prices[i] = price
+            quantity, cost = self.open_quantity, self.open_cost
+            profits = {symbol: price * quantity[i] - cost[i] for symbol, i, price in hits if quantity[i] > EPSILON}
+            if self.legacy:
+                for symbol in self.legacy.keys() & prices.keys():
+                    holding, entry_price = self.legacy[symbol]
+                    self.legacy_prices[symbol] = price = prices[symbol]
+                    profits[symbol] = (price - entry_price) * holding
+            return profits
+
+    def unrealized(self, symbol: str, price: float) -> Optional[float]:
+        """Return unrealized P&L of symbol at price without marking it"""
+        i = self.index.get(symbol)
+        if i is None and symbol in self.legacy:
+            holding, entry_price = self.legacy[symbol]
+            return (price - entry_price) * holding
+        if i is None or self.open_quantity[i] <= EPSILON:
+            return None
+        return price * self.open_quantity[i] - self.open_cost[i]
+
+    def totals(self) -> PortfolioTotals:
+        """Sum value, cost and P&L over all symbols at their last marked prices"""
+        value = cost = unrealized = 0.0
+        priced = held = 0
+        with self._lock:
+            for quantity, open_cost, price in zip(self.open_quantity, self.open_cost, self.prices):
+                if quantity <= EPSILON:
+                    continue
+                held += 1
+                if price != price:  # NaN: not priced yet
+                    continue
+                priced += 1
+                value += price * quantity
+                cost += open_cost
+            for symbol, (holding, entry_price) in self.legacy.items():
+                if not holding:
+                    continue
+                held += 1
+                if symbol not in self.legacy_prices:
+                    continue
+                priced += 1
+                value += self.legacy_prices[symbol] * holding  # Negative for a short
+                cost += entry_price * holding
+            unrealized = value - cost
+            realized = sum(self.realized)
+        return PortfolioTotals(value, cost, unrealized, realized, priced, held)
+
+    def to_config(self) -> dict:
+        """Return the portfolio in its config.json form"""
+        lots = {}
+        for symbol, trades in self.trades.items():
+            lots[symbol] = [
+                {'time': t, 'quantity': q, 'price': p, **({'fee': f} if f else {})}
+                for t, q, p, f in zip(trades.times, trades.quantities, trades.prices, trades.fees)
+            ]
+        return {'method': self.method, 'lots': lots}
+
+    @classmethod
+    def from_config(cls, data: Optional[dict], coin_data: Optional[Dict[str, dict]] = None) -> 'Portfolio':
+        """Build a portfolio from config['portfolio'] and legacy coin_data positions
+
+        Without lots, positive coin_data holdings become buy lots; zero and short holdings are always
+        read from coin_data, which keeps them after the migration.
+        """
+        data = data if isinstance(data, dict) else {}
+        portfolio = cls(data.get('method', DEFAULT_METHOD))
+        migrated, kept = split_coin_data(coin_data or {})
+        lots = data.get('lots')
+        if not isinstance(lots, dict):
+            lots = migrated
+        for symbol, entries in lots.items():
+            for entry in entries:
+                portfolio.add_trade(symbol, entry['quantity'], entry['price'],
+                                    entry.get('time', 0), entry.get('fee', 0.0), rebuild=False)
+        portfolio.rebuild()
+        for symbol, position in kept.items():
+            if symbol not in lots:  # Lots of the same symbol take over its P&L
+                portfolio.add_legacy(symbol, position['current_holding'], position['entry_price'])
+        return portfolio
+
+    def __len__(self) -> int:
+        return len(self.index.keys() | self.legacy.keys())
+
+
+def split_coin_data(coin_data: Dict[str, dict]) -> Tuple[Dict[str, List[dict]], Dict[str, dict]]:
+    """Split legacy coin_data into single buy lots (positive holdings) and the entries lots cannot express
+
+    A zero or short holding has no opening buy, so it stays a legacy position with its original P&L.
+    """
+    lots = {}
+    kept = {}
+    for symbol, position in coin_data.items():
+        if position['current_holding'] > 0:
+            lots[symbol] = [{'time': 0, 'quantity': position['current_holding'], 'price': position['entry_price']}]
+        else:
+            kept[symbol] = position
+    return lots, kept
+
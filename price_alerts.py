@@ -0,0 +1,192 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import bisect
+from price_history import PriceHistory, HISTORY_SPAN
+
+# Constants
+ALERT_KINDS = ('above', 'below', 'move')
+MAX_MOVE_WINDOW = HISTORY_SPAN  # seconds; a longer window would look past the oldest sample and never fire
+ALERT_COOLDOWN = 60.0  # seconds before the same alert may fire again (stops flapping around a threshold)
+
+
+class Alert(NamedTuple):
+    """One alert rule"""
+    symbol: str
+    kind: str  # 'above' / 'below': price crosses value; 'move': % change over window reaches value
+    value: float  # Price, or signed % for moves (+5 rise, -5 drop)
+    window: float = 0.0  # seconds, for moves
+
+
+class AlertTrigger(NamedTuple):
+    """An alert that fired"""
+    alert: Alert
+    price: float
+    change: Optional[float]  # % change over the window, for moves
+    time: float
+
+
+class ThresholdIndex:
+    """Alerts sorted by threshold, so a tick only looks at the span it moved through"""
+
+    __slots__ = ('values', 'alerts')
+
+    def __init__(self) -> None:
+        self.values: List[float] = []
+        self.alerts: List[Alert] = []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def add(self, value: float, alert: Alert) -> None:
+        position = bisect.bisect_right(self.values, value)
+        self.values.insert(position, value)
+        self.alerts.insert(position, alert)
+
+    def remove(self, value: float, alert: Alert) -> bool:
+        position = bisect.bisect_left(self.values, value)
+        while position < len(self.values) and self.values[position] == value:
+            if self.alerts[position] == alert:
+                del self.values[position]
+                del self.alerts[position]
+                return True
+            position += 1
+        return False
+
+    def rising(self, old: float, new: float) -> List[Alert]:
+        """Return alerts with old < threshold <= new"""
+        return self.alerts[bisect.bisect_right(self.values, old):bisect.bisect_right(self.values, new)]
+
+    def falling(self, old: float, new: float) -> List[Alert]:
+        """Return alerts with new <= threshold < old"""
+        return self.alerts[bisect.bisect_left(self.values, new):bisect.bisect_left(self.values, old)]
+
+
+class SymbolAlerts:
+    """Alert indexes and the last evaluated values of one symbol"""
+
+    __slots__ = ('above', 'below', 'moves', 'last_price', 'last_change')
+
+    def __init__(self) -> None:
+        self.above = ThresholdIndex()
+        self.below = ThresholdIndex()
+        self.moves: Dict[float, Tuple[ThresholdIndex, ThresholdIndex]] = {}  # window -> (rises, drops)
+        self.last_price: Optional[float] = None
+        self.last_change: Dict[float, float] = {}
+
+    def index_for(self, alert: Alert, create: bool = False) -> Optional[ThresholdIndex]:
+        """Return the index an alert belongs to"""
+        if alert.kind == 'above':
+            return self.above
+        if alert.kind == 'below':
+            return self.below
+        pair = self.moves.get(alert.window)
+        if pair is None:
+            if not create:
+                return None
+            pair = self.moves[alert.window] = (ThresholdIndex(), ThresholdIndex())
+        return pair[0] if alert.value >= 0 else pair[1]
+
+    def is_empty(self) -> bool:
+        return not self.above and not self.below and not any(rises or drops for rises, drops in self.moves.values())
+
+
+def parse_alert(entry: dict) -> Alert:
+    """Build an alert from its config form, e.g. {"symbol": "BTCUSDT", "above": 70000}
+    or {"symbol": "ETHUSDT", "move": -5, "window": 900}; raises KeyError/ValueError"""
+    for kind in ALERT_KINDS:
+        if kind in entry:
+            window = float(entry.get('window', 0)) if kind == 'move' else 0.0
+            if kind == 'move' and window <= 0:
+                raise ValueError(f"move alert on {entry['symbol']} needs a positive window")
+            if window > MAX_MOVE_WINDOW:
+                raise ValueError(f"move alert on {entry['symbol']}: window {window:g}s exceeds the "
+                                 f"{MAX_MOVE_WINDOW:g}s of price history")
+            return Alert(entry['symbol'], kind, float(entry[kind]), window)
+    raise ValueError(f"alert needs one of {', '.join(ALERT_KINDS)}")
+
+
+class AlertEngine:
+    """Evaluates price-crossing and %-move alerts as prices arrive"""
+
+    def __init__(self, cooldown: float = ALERT_COOLDOWN) -> None:
+        self.cooldown = cooldown
+        self.symbols: Dict[str, SymbolAlerts] = {}
+        self.last_fired: Dict[Alert, float] = {}
+
+    def __len__(self) -> int:
+        return sum(len(entry.above) + len(entry.below) +
+                   sum(len(rises) + len(drops) for rises, drops in entry.moves.values())
+                   for entry in self.symbols.values())
+
+    def add(self, alert: Alert) -> None:
+        """Add an alert"""
+        entry = self.symbols.get(alert.symbol)
+        if entry is None:
+            entry = self.symbols[alert.symbol] = SymbolAlerts()
+        entry.index_for(alert, create=True).add(alert.value, alert)
+
+    def remove(self, alert: Alert) -> bool:
+        """Remove an alert; returns whether it existed"""
+        entry = self.symbols.get(alert.symbol)
+        index = entry.index_for(alert) if entry else None
+        if index is None or not index.remove(alert.value, alert):
+            return False
+        self.last_fired.pop(alert, None)
+        if entry.is_empty():
+            del self.symbols[alert.symbol]
+        return True
+
+    def load(self, entries: List[dict]) -> None:
+        """Add alerts from their config form, skipping invalid ones"""
+        for entry in entries:
+            try:
+                self.add(parse_alert(entry))
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Alert config error: {e}")
+
+    def check(self, symbol: str, price: float, timestamp: float,
+              history: Optional[PriceHistory] = None) -> List[AlertTrigger]:
+        """Evaluate the alerts of symbol against a new price; history supplies the window start for moves"""
+        entry = self.symbols.get(symbol)
+        if entry is None:
+            return []
+        hits: List[Tuple[Alert, Optional[float]]] = []
+
+        previous = entry.last_price
+        entry.last_price = price
+        if previous is not None:  # A crossing needs a known starting side
+            if price > previous:
+                hits.extend((alert, None) for alert in entry.above.rising(previous, price))
+            elif price < previous:
+                hits.extend((alert, None) for alert in entry.below.falling(previous, price))
+
+        if history is not None:
+            for window, (rises, drops) in entry.moves.items():
+                base = history.price_at(timestamp - window)
+                if not base:
+                    continue  # Not enough history yet
+                change = (price - base) / base * 100
+                previous_change = entry.last_change.get(window, 0.0)
+                entry.last_change[window] = change
+                if change > previous_change:
+                    hits.extend((alert, change) for alert in rises.rising(previous_change, change))
+                elif change < previous_change:
+                    hits.extend((alert, change) for alert in drops.falling(previous_change, change))
+
+        triggers = []
+        for alert, change in hits:
+            if timestamp - self.last_fired.get(alert, float('-inf')) < self.cooldown:
+                continue
+            self.last_fired[alert] = timestamp
+            triggers.append(AlertTrigger(alert, price, change, timestamp))
+        return triggers
+
+
+def describe(trigger: AlertTrigger) -> str:
+    """Return a short, language-neutral description of a trigger"""
+    alert = trigger.alert
+    if alert.kind == 'above':
+        return f'{alert.symbol} ↑ {alert.value:g} ({trigger.price:g})'
+    if alert.kind == 'below':
+        return f'{alert.symbol} ↓ {alert.value:g} ({trigger.price:g})'
+    minutes = alert.window / 60
+    return f'{alert.symbol} {trigger.change:+.1f}% / {minutes:g}m ({trigger.price:g})'
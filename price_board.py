@@ -0,0 +1,256 @@
+from typing import Dict, List, Set, Tuple
+import time
+from PyQt5.QtCore import QEvent, QItemSelection, QItemSelectionModel, QModelIndex, QPointF, QRect, Qt, QTimer
+from PyQt5.QtGui import QColor, QFontMetrics, QPainter, QRegion, QStaticText
+from PyQt5.QtWidgets import QAbstractItemView, QFrame
+from layout_settings import SPARKLINE_WIDTH
+from metrics import metrics
+from price_model import (
+    FLASH_ROLE, HISTORY_ROLE, NAME_COLUMN, PRICE_COLUMN, HISTORY_COLUMN, COLUMN_COUNT, PRICE_COLOR, paint_sparkline
+)
+
+# Constants
+BOARD_FRAME_INTERVAL = 33  # ms, at most ~30 repaints per second however fast updates arrive
+CELL_PADDING = 5  # px, as TABLE_STYLE's item padding
+
+# Cached colours (the look of TABLE_STYLE)
+BACKGROUND_COLOR = QColor("#1E2329")
+GRID_COLOR = QColor("#2B3139")
+SELECTED_COLOR = QColor("#363C45")
+
+
+class PriceBoard(QAbstractItemView):
+    """Price board that paints its rows directly instead of styling every item
+
+    Fonts, colours and laid-out cell texts are cached; model updates only mark rows dirty, and dirty rows
+    are repainted together at most every BOARD_FRAME_INTERVAL ms.
+    """
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.viewport().setAttribute(Qt.WA_OpaquePaintEvent)  # Every pixel is painted below
+        self._texts: Dict[Tuple[int, int], QStaticText] = {}  # (row, column) -> laid-out, elided text
+        self._pens: Dict[int, object] = {}  # Sparkline pens per colour
+        self._columns: List[Tuple[int, int]] = []  # (x, width) per column
+        self._price_width = 0  # Widest price text so far; the price column fits its contents
+        self._dirty: Set[int] = set()
+        self._last_frame = 0.0
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.timeout.connect(self._flush)
+        self._update_font()
+
+    def _update_font(self) -> None:
+        """Cache font metrics and the row height"""
+        self._metrics = QFontMetrics(self.font())
+        self.row_height = self._metrics.height() + 2 * CELL_PADDING + 1  # + 1 px grid line
+
+    def changeEvent(self, event) -> None:
+        super().changeEvent(event)
+        if event.type() == QEvent.FontChange:
+            self._update_font()
+            self.reset()
+
+    # Geometry
+
+    def _layout_columns(self) -> None:
+        """Split the width like the table: name and profit stretch, price fits, history is fixed"""
+        width = self.viewport().width()
+        price = self._price_width + 2 * CELL_PADDING
+        stretch = max(0, width - price - SPARKLINE_WIDTH) // 2
+        widths = [stretch, price, max(0, width - price - SPARKLINE_WIDTH - stretch), SPARKLINE_WIDTH]
+        x = 0
+        self._columns = []
+        for column_width in widths:
+            self._columns.append((x, column_width))
+            x += column_width
+        self._texts.clear()  # Elision depends on the column widths
+
+    def _row_rect(self, row: int) -> QRect:
+        return QRect(0, row * self.row_height - self.verticalOffset(), self.viewport().width(), self.row_height)
+
+    def updateGeometries(self) -> None:
+        rows = self.model().rowCount() if self.model() else 0
+        scroll_bar = self.verticalScrollBar()
+        scroll_bar.setSingleStep(self.row_height)
+        scroll_bar.setPageStep(self.viewport().height())
+        scroll_bar.setRange(0, max(0, rows * self.row_height - self.viewport().height()))
+        super().updateGeometries()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self._layout_columns()
+        self.updateGeometries()
+
+    def visualRect(self, index: QModelIndex) -> QRect:
+        if not index.isValid() or not self._columns:
+            return QRect()
+        x, width = self._columns[index.column()]
+        return QRect(x, index.row() * self.row_height - self.verticalOffset(), width, self.row_height)
+
+    def visualRegionForSelection(self, selection: QItemSelection) -> QRegion:
+        region = QRegion()
+        for selection_range in selection:
+            for row in range(selection_range.top(), selection_range.bottom() + 1):
+                region += self._row_rect(row)
+        return region
+
+    def indexAt(self, point) -> QModelIndex:
+        model = self.model()
+        if model is None:
+            return QModelIndex()
+        row = (point.y() + self.verticalOffset()) // self.row_height
+        for column, (x, width) in enumerate(self._columns):
+            if x <= point.x() < x + width:
+                return model.index(row, column) if 0 <= row < model.rowCount() else QModelIndex()
+        return QModelIndex()
+
+    def scrollTo(self, index: QModelIndex, hint=QAbstractItemView.EnsureVisible) -> None:
+        if not index.isValid():
+            return
+        top = index.row() * self.row_height
+        scroll_bar = self.verticalScrollBar()
+        if top < scroll_bar.value():
+            scroll_bar.setValue(top)
+        elif top + self.row_height > scroll_bar.value() + self.viewport().height():
+            scroll_bar.setValue(top + self.row_height - self.viewport().height())
+
+    def moveCursor(self, action, modifiers) -> QModelIndex:
+        model = self.model()
+        if model is None or not model.rowCount():
+            return QModelIndex()
+        row = self.currentIndex().row()
+        page = max(1, self.viewport().height() // self.row_height)
+        if action in (QAbstractItemView.MoveUp, QAbstractItemView.MovePrevious):
+            row -= 1
+        elif action in (QAbstractItemView.MoveDown, QAbstractItemView.MoveNext):
+            row += 1
+        elif action == QAbstractItemView.MovePageUp:
+            row -= page
+        elif action == QAbstractItemView.MovePageDown:
+            row += page
+        elif action == QAbstractItemView.MoveHome:
+            row = 0
+        elif action == QAbstractItemView.MoveEnd:
+            row = model.rowCount() - 1
+        return model.index(min(max(row, 0), model.rowCount() - 1), NAME_COLUMN)
+
+    def horizontalOffset(self) -> int:
+        return 0
+
+    def verticalOffset(self) -> int:
+        return self.verticalScrollBar().value()
+
+    def isIndexHidden(self, index: QModelIndex) -> bool:
+        return False
+
+    def setSelection(self, rect: QRect, flags) -> None:
+        model = self.model()
+        if model is None or not model.rowCount():
+            return
+        last = model.rowCount() - 1
+        top = min(max((rect.top() + self.verticalOffset()) // self.row_height, 0), last)
+        bottom = min(max((rect.bottom() + self.verticalOffset()) // self.row_height, 0), last)
+        selection = QItemSelection(model.index(min(top, bottom), 0), model.index(max(top, bottom), COLUMN_COUNT - 1))
+        self.selectionModel().select(selection, flags | QItemSelectionModel.Rows)
+
+    # Model updates
+
+    def reset(self) -> None:
+        super().reset()
+        self._texts.clear()
+        self._dirty.clear()
+        self._price_width = 0
+        self._layout_columns()
+        self.updateGeometries()
+        self.viewport().update()
+
+    def dataChanged(self, top_left: QModelIndex, bottom_right: QModelIndex, roles=()) -> None:
+        """Drop cached texts of the changed cells and queue their rows for the next frame"""
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            for column in range(top_left.column(), bottom_right.column() + 1):
+                self._texts.pop((row, column), None)
+            self._dirty.add(row)
+        if not self._frame_timer.isActive():
+            wait = BOARD_FRAME_INTERVAL - (time.monotonic() - self._last_frame) * 1000
+            self._frame_timer.start(max(0, int(wait)))
+
+    def _flush(self) -> None:
+        """Repaint the dirty rows that are visible"""
+        self._last_frame = time.monotonic()
+        visible = self.viewport().rect()
+        region = QRegion()
+        for row in self._dirty:
+            rect = self._row_rect(row)
+            if rect.intersects(visible):
+                region += rect
+        self._dirty.clear()
+        if not region.isEmpty():
+            self.viewport().update(region)
+
+    # Painting
+
+    def _text(self, row: int, column: int) -> QStaticText:
+        """Return the laid-out text of a cell, building it on first use after a change"""
+        text = self._texts.get((row, column))
+        if text is None:
+            value = self.model().index(row, column).data(Qt.DisplayRole) or ''
+            if column == PRICE_COLUMN:
+                width = self._metrics.horizontalAdvance(value) + 1  # Advances are rounded; elision must not trigger
+                if width > self._price_width:
+                    # The price column grows to fit, like ResizeToContents; everything is laid out again
+                    self._price_width = width
+                    self._layout_columns()
+                    self.viewport().update()
+            available = self._columns[column][1] - 2 * CELL_PADDING
+            text = QStaticText(self._metrics.elidedText(value, Qt.ElideRight, max(0, available)))
+            text.setTextFormat(Qt.PlainText)
+            text.prepare(font=self.font())
+            self._texts[(row, column)] = text
+        return text
+
+    def paintEvent(self, event) -> None:
+        started = time.perf_counter()
+        model = self.model()
+        painter = QPainter(self.viewport())
+        clip = event.rect()
+        painter.fillRect(clip, BACKGROUND_COLOR)
+        if model is not None and model.rowCount() and self._columns:
+            painter.setFont(self.font())
+            first = max(0, (clip.top() + self.verticalOffset()) // self.row_height)
+            last = min(model.rowCount() - 1, (clip.bottom() + self.verticalOffset()) // self.row_height)
+            selection = self.selectionModel()
+            for row in range(first, last + 1):
+                self._paint_row(painter, model, row, selection.isRowSelected(row, QModelIndex()))
+        painter.end()
+        metrics.observe('table_paint_seconds', time.perf_counter() - started)
+
+    def _paint_row(self, painter: QPainter, model, row: int, selected: bool) -> None:
+        """Paint one row: background, cell texts, sparkline, flash and grid line"""
+        rect = self._row_rect(row)
+        if selected:
+            painter.fillRect(rect, SELECTED_COLOR)
+        text_top = rect.top() + CELL_PADDING
+        for column, (x, width) in enumerate(self._columns):
+            index = model.index(row, column)
+            color = index.data(Qt.ForegroundRole) or PRICE_COLOR
+            if column == HISTORY_COLUMN:
+                paint_sparkline(painter, QRect(x, rect.top(), width, self.row_height - 1),
+                                index.data(HISTORY_ROLE), color, self._pens)
+            text = self._text(row, column)
+            if column == NAME_COLUMN:
+                left = x + CELL_PADDING
+            else:
+                left = x + width - CELL_PADDING - text.size().width()
+            painter.setPen(color)
+            painter.drawStaticText(QPointF(left, text_top), text)
+        flash = model.index(row, NAME_COLUMN).data(FLASH_ROLE)
+        if flash is not None:
+            painter.fillRect(rect, flash)
+        painter.setPen(GRID_COLOR)
+        painter.drawLine(rect.left(), rect.bottom(), rect.right(), rect.bottom())
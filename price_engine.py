@@ -0,0 +1,221 @@
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from itertools import zip_longest
+import sys
+import time
+from http_client import CircuitOpenError, is_client_error
+from metrics import metrics
+from portfolio import Portfolio, PortfolioTotals
+from providers import PriceSource, FETCH_ERRORS, create_sources
+
+# Constants
+MAX_FETCH_WORKERS = 8  # Upper bound on requests in flight across all providers
+TICK_TIMEOUT = 5.0  # seconds a tick waits for all providers; later batches count as failed
+
+
+class Quote(NamedTuple):
+    """Price and P&L of one symbol"""
+    symbol: str
+    price: float
+    profit: Optional[float]  # None when no position is held
+    time: float
+    source: str
+
+
+class PriceSnapshot(NamedTuple):
+    """Result of one engine tick"""
+    quotes: Dict[str, Quote]
+    failed: Set[str]
+    time: float
+    duration: float  # seconds spent fetching
+    totals: Optional[PortfolioTotals] = None  # Whole portfolio at the last known prices
+
+
+class PriceEngine:
+    """Fetches prices from all providers concurrently and publishes merged, typed snapshots"""
+
+    def __init__(self, sources: List[PriceSource] = None, portfolio: Portfolio = None,
+                 max_workers: int = MAX_FETCH_WORKERS, tick_timeout: float = TICK_TIMEOUT) -> None:
+        # Routing order: specific providers (FX, KRW venues) before the catch-all Binance source
+        self.sources = sources if sources is not None else create_sources()
+        self.portfolio = portfolio if portfolio is not None else Portfolio()
+        self._subscribers: List[Callable[[PriceSnapshot], None]] = []
+        # Each provider's semaphore caps its own requests; the pool only bounds the total
+        workers = min(max_workers, sum(source.max_connections for source in self.sources) or 1)
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self.tick_timeout = tick_timeout
+        self._late: Dict[PriceSource, List[Future]] = {}  # Batches still running after their tick gave up
+
+    def subscribe(self, callback: Callable[[PriceSnapshot], None]) -> None:
+        """Call callback with every snapshot (on the thread that produced it)"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[PriceSnapshot], None]) -> None:
+        """Stop calling callback"""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def set_portfolio(self, portfolio: Portfolio) -> None:
+        """Replace the portfolio used for P&L"""
+        self.portfolio = portfolio
+
+    def quote(self, symbol: str, price: float, source: str, timestamp: float = None) -> Quote:
+        """Build a quote with P&L for symbol (without marking the portfolio)"""
+        return Quote(symbol, price, self.portfolio.unrealized(symbol, price),
+                     time.time() if timestamp is None else timestamp, source)
+
+    def _quotes(self, prices: Dict[str, float], source: Dict[str, str], now: float,
+                times: Dict[str, float] = None) -> Dict[str, Quote]:
+        """Mark the portfolio with prices and build quotes; P&L of all symbols comes from one batched pass
+
+        times overrides now for prices a source published earlier (e.g. a cached FX table).
+        """
+        profits = self.portfolio.mark(prices)
+        times = times or {}
+        return {symbol: Quote(symbol, price, profits.get(symbol), times.get(symbol, now), source[symbol])
+                for symbol, price in prices.items()}
+
+    def _totals(self) -> Optional[PortfolioTotals]:
+        """Return portfolio totals, or None without any lots"""
+        return self.portfolio.totals() if len(self.portfolio) else None
+
+    def route(self, symbols: List[str]) -> Dict[PriceSource, List[str]]:
+        """Group symbols by the first source that handles them"""
+        groups: Dict[PriceSource, List[str]] = {}
+        for symbol in symbols:
+            source = self.source_for(symbol)
+            if source is not None:
+                groups.setdefault(source, []).append(symbol)
+        return groups
+
+    def source_for(self, symbol: str) -> Optional[PriceSource]:
+        """Return the provider that prices symbol"""
+        for source in self.sources:
+            if source.handles(symbol):
+                return source
+        return None
+
+    def trading_url(self, symbol: str) -> Optional[str]:
+        """Return the trading or chart page of symbol from its provider"""
+        source = self.source_for(symbol)
+        return source.trading_url(symbol) if source else None
+
+    def tick(self, symbols: List[str]) -> PriceSnapshot:
+        """Fetch symbols from every provider concurrently (blocking) and publish the merged snapshot"""
+        started = time.perf_counter()
+        prices: Dict[str, Dict[str, float]] = {}
+        times: Dict[str, float] = {}
+        failed: Set[str] = set()
+        jobs = []
+        queued = []
+        for source, group in self.route(symbols).items():
+            if source.is_cached(group):
+                jobs.append((source, group, None))  # Answered inline below
+                continue
+            late = [job for job in self._late.pop(source, ()) if not job.done()]
+            if late:
+                # A hanging host keeps its late batches; queueing more would only tie up the pool
+                self._late[source] = late
+                failed.update(group)
+                continue
+            batches = []
+            for batch in source.batches(group):
+                # An open circuit skips the provider; once the cooldown ends, one batch goes out as the probe
+                if source.breaker.allow():
+                    batches.append((source, batch))
+                else:
+                    failed.update(batch)
+            queued.append(batches)
+        # Submit round-robin so one provider's extra batches never queue ahead of another provider's first
+        for round_jobs in zip_longest(*queued):
+            for source, batch in filter(None, round_jobs):
+                jobs.append((source, batch, self._executor.submit(self._fetch_limited, source, batch)))
+
+        deadline = time.monotonic() + self.tick_timeout
+        for source, batch, job in jobs:
+            try:
+                result = source.fetch(batch) if job is None else job.result(max(0.0, deadline - time.monotonic()))
+                prices.setdefault(source.name, {}).update(result)
+                published = source.price_time()
+                if published is not None:
+                    times.update(dict.fromkeys(result, published))
+            except FutureTimeoutError:
+                # One slow provider must not hold back the others' prices
+                print(f"Failed to fetch prices from {source.name}: no answer within {self.tick_timeout:g}s")
+                metrics.inc('price_source_errors_total', source=source.name)
+                self._late.setdefault(source, []).append(job)
+                source.breaker.record_failure()
+                failed.update(batch)
+            except FETCH_ERRORS as e:
+                if not isinstance(e, CircuitOpenError):  # Already reported when the endpoint's circuit opened
+                    print(f"Failed to fetch prices from {source.name}: {e}")
+                    metrics.inc('price_source_errors_total', source=source.name)
+                if job is not None and not is_client_error(e):
+                    source.breaker.record_failure()
+                failed.update(batch)
+            else:
+                if job is not None:
+                    source.breaker.record_success()
+
+        now = time.time()
+        merged: Dict[str, float] = {}
+        origin: Dict[str, str] = {}
+        for name, source_prices in prices.items():
+            merged.update(source_prices)
+            origin.update(dict.fromkeys(source_prices, name))
+        quotes = self._quotes(merged, origin, now, times)
+        # Symbols a source silently left out of its response count as failures
+        failed.update(symbol for symbol in symbols if symbol not in quotes)
+        duration = time.perf_counter() - started
+        metrics.observe('price_tick_seconds', duration)
+        metrics.inc('price_tick_failed_symbols_total', len(failed))
+        return self._publish(PriceSnapshot(quotes, failed, now, duration, self._totals()))
+
+    def _fetch_limited(self, source: PriceSource, symbols: List[str]) -> Dict[str, float]:
+        """Fetch one batch while holding one of the provider's connection slots (runs on the pool)"""
+        with source.connections:
+            return source.fetch(symbols)
+
+    def publish(self, prices: Dict[str, float], source: str, timestamp: float = None,
+                failed: Iterable[str] = ()) -> PriceSnapshot:
+        """Publish prices pushed from outside (e.g. a stream, a replay or the price hub) as a snapshot"""
+        now = time.time() if timestamp is None else timestamp
+        quotes = self._quotes(prices, dict.fromkeys(prices, source), now)
+        return self._publish(PriceSnapshot(quotes, set(failed), now, 0.0, self._totals()))
+
+    def close(self) -> None:
+        """Stop the fetch pool"""
+        self._executor.shutdown(wait=False)
+
+    def _publish(self, snapshot: PriceSnapshot) -> PriceSnapshot:
+        """Hand snapshot to subscribers"""
+        for callback in list(self._subscribers):
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"Price subscriber error: {e}")
+        return snapshot
+
+
+def main(argv: List[str]) -> None:
+    """Poll symbols headlessly and print each snapshot (no PyQt or pywin32 needed)
+
+    Usage: python price_engine.py BTCUSDT ETHUSDT KRW-USD
+    """
+    symbols = argv or ['BTCUSDT']
+    engine = PriceEngine()
+    engine.subscribe(lambda snapshot: print(
+        f"{time.strftime('%H:%M:%S')} {snapshot.duration * 1000:.0f} ms  " +
+        "  ".join(f"{quote.symbol}={quote.price:g}" for quote in snapshot.quotes.values()) +
+        (f"  failed={sorted(snapshot.failed)}" if snapshot.failed else "")
+    ))
+    try:
+        while True:
+            engine.tick(symbols)
+            time.sleep(2.5)
+    except KeyboardInterrupt:
+        engine.close()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
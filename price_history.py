@@ -0,0 +1,100 @@
+from typing import Dict, List, Optional
+from array import array
+import time
+
+# Constants
+HISTORY_SIZE = 721  # Samples kept per symbol (one hour of intervals plus the newest sample)
+HISTORY_SAMPLE_INTERVAL = 5.0  # seconds between samples, at least
+HISTORY_SPAN = (HISTORY_SIZE - 1) * HISTORY_SAMPLE_INTERVAL  # seconds a full history always reaches back
+
+
+class PriceHistory:
+    """Fixed-size ring buffer of (timestamp, price) backed by preallocated double arrays"""
+
+    __slots__ = ('size', 'times', 'prices', 'start', 'count')
+
+    def __init__(self, size: int = HISTORY_SIZE) -> None:
+        self.size = size
+        self.times = array('d', bytes(8 * size))
+        self.prices = array('d', bytes(8 * size))
+        self.start = 0  # Position of the oldest sample
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, timestamp: float, price: float) -> None:
+        """Add a sample, overwriting the oldest one when full"""
+        if self.count < self.size:
+            position = (self.start + self.count) % self.size
+            self.count += 1
+        else:
+            position = self.start
+            self.start = (self.start + 1) % self.size
+        self.times[position] = timestamp
+        self.prices[position] = price
+
+    def last_time(self) -> float:
+        """Return timestamp of the newest sample (0 when empty)"""
+        if not self.count:
+            return 0.0
+        return self.times[(self.start + self.count - 1) % self.size]
+
+    def price_at(self, timestamp: float) -> Optional[float]:
+        """Return the newest price sampled at or before timestamp (None if the history starts later)"""
+        low, high = 0, self.count  # Binary search over logical positions, oldest first
+        while low < high:
+            middle = (low + high) // 2
+            if self.times[(self.start + middle) % self.size] <= timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        if low == 0:
+            return None
+        return self.prices[(self.start + low - 1) % self.size]
+
+    def values(self) -> List[float]:
+        """Return prices oldest first"""
+        end = self.start + self.count
+        if end <= self.size:
+            return self.prices[self.start:end].tolist()
+        return (self.prices[self.start:] + self.prices[:end - self.size]).tolist()
+
+    def change_percent(self) -> Optional[float]:
+        """Return % change between the oldest and newest sample"""
+        if self.count < 2:
+            return None
+        first = self.prices[self.start]
+        last = self.prices[(self.start + self.count - 1) % self.size]
+        if not first:
+            return None
+        return (last - first) / first * 100
+
+
+class PriceHistoryStore:
+    """Price histories of the selected symbols"""
+
+    def __init__(self, size: int = HISTORY_SIZE, sample_interval: float = HISTORY_SAMPLE_INTERVAL) -> None:
+        self.size = size
+        self.sample_interval = sample_interval
+        self.histories: Dict[str, PriceHistory] = {}
+
+    def get(self, symbol: str) -> Optional[PriceHistory]:
+        """Return history of symbol, if any"""
+        return self.histories.get(symbol)
+
+    def record(self, symbol: str, price: float, timestamp: float = None) -> bool:
+        """Record price unless the last sample is more recent than the sample interval"""
+        timestamp = time.time() if timestamp is None else timestamp
+        history = self.histories.get(symbol)
+        if history is None:
+            history = self.histories[symbol] = PriceHistory(self.size)
+        elif timestamp - history.last_time() < self.sample_interval:
+            return False
+        history.append(timestamp, price)
+        return True
+
+    def retain(self, symbols: List[str]) -> None:
+        """Drop histories of symbols no longer shown"""
+        for symbol in set(self.histories) - set(symbols):
+            del self.histories[symbol]
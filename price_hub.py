@@ -0,0 +1,198 @@
+from typing import Dict, Iterable, List, Optional, Set
+import getpass
+import json
+import os
+import re
+from PyQt5.QtCore import QDir, QLockFile, QObject, pyqtSignal
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
+
+# Constants
+HUB_PREFIX = "bitcoin-widget-price-hub"
+CONNECT_TIMEOUT = 300  # ms to wait for a running hub before becoming the hub
+MAX_LINE_LENGTH = 1 << 20  # bytes, a longer unterminated message drops the connection
+
+
+def user_hub_name() -> str:
+    """Return the hub name of the current user; instances of other users never feed this user's widgets"""
+    try:
+        user = getpass.getuser()
+    except (KeyError, OSError):
+        user = 'default'
+    return f'{HUB_PREFIX}-{re.sub(r"[^A-Za-z0-9_.-]", "_", user)}'  # Usable as a socket, pipe and file name
+
+
+HUB_NAME = user_hub_name()  # Local socket (Unix) / named pipe (Windows) shared by one user's instances
+
+
+def encode(message: dict) -> bytes:
+    """Return message as one newline-terminated JSON line"""
+    return json.dumps(message, separators=(',', ':')).encode() + b'\n'
+
+
+def read_messages(socket: QLocalSocket) -> List[dict]:
+    """Return the complete JSON lines waiting on socket"""
+    messages = []
+    while socket.canReadLine():
+        line = bytes(socket.readLine())
+        try:
+            message = json.loads(line)
+        except ValueError as e:
+            print(f"Invalid hub message: {e}")
+            continue
+        if isinstance(message, dict):
+            messages.append(message)
+    if socket.bytesAvailable() > MAX_LINE_LENGTH:
+        print("Hub message too long, disconnecting")
+        socket.abort()
+    return messages
+
+
+class Subscription:
+    """Symbols one attached instance wants"""
+
+    __slots__ = ('symbols', 'held')
+
+    def __init__(self) -> None:
+        self.symbols: Set[str] = set()
+        self.held: Set[str] = set()  # Symbols with an open position, polled at the faster cadence
+
+
+class PriceHub(QObject):
+    """Owns the fetch loop for every instance on the machine and fans prices out over a local socket
+
+    Protocol (one JSON object per line):
+      instance -> hub: {"symbols": [...], "held": [...]}  replaces the instance's subscription
+      hub -> instance: {"time": t, "prices": {symbol: price}, "failed": [...]}  subscribed symbols only
+    """
+
+    subscriptions_changed = pyqtSignal()
+
+    def __init__(self, name: str = HUB_NAME, parent=None) -> None:
+        super().__init__(parent)
+        self.name = name
+        self.server = QLocalServer(self)  # Default options: only this user can attach
+        self.server.newConnection.connect(self._on_new_connection)
+        self.subscriptions: Dict[QLocalSocket, Subscription] = {}
+        # Held for the hub's lifetime; elects the hub, since listen() alone may replace a live hub's socket
+        self.lock = QLockFile(os.path.join(QDir.tempPath(), f'{name}.lock'))
+        self.lock.setStaleLockTime(0)  # Only a dead holder's lock is stale, however long the hub runs
+
+    def listen(self) -> bool:
+        """Start serving; False when another instance already is the hub"""
+        if not self.lock.tryLock(0):
+            return False
+        # The lock holder is the only hub, so an existing socket was left behind by a crashed one
+        QLocalServer.removeServer(self.name)
+        if self.server.listen(self.name):
+            return True
+        print(f"Price hub error: {self.server.errorString()}")
+        self.lock.unlock()
+        return False
+
+    def close(self) -> None:
+        """Stop serving; attached instances notice the disconnect and elect a new hub"""
+        self.server.close()
+        for socket in list(self.subscriptions):
+            socket.disconnected.disconnect()
+            socket.disconnectFromServer()
+        self.subscriptions.clear()
+        self.lock.unlock()
+
+    def __len__(self) -> int:
+        return len(self.subscriptions)
+
+    def symbols(self) -> Set[str]:
+        """Return the union of all attached instances' symbols"""
+        return set().union(*(subscription.symbols for subscription in self.subscriptions.values()))
+
+    def held_symbols(self) -> Set[str]:
+        """Return the union of all attached instances' held symbols"""
+        return set().union(*(subscription.held for subscription in self.subscriptions.values()))
+
+    def publish(self, prices: Dict[str, float], failed: Iterable[str], timestamp: float) -> None:
+        """Send each attached instance the prices and failures of its own symbols"""
+        failed = set(failed)
+        for socket, subscription in self.subscriptions.items():
+            wanted = subscription.symbols
+            subset = {symbol: price for symbol, price in prices.items() if symbol in wanted}
+            missing = sorted(failed & wanted)
+            if subset or missing:
+                socket.write(encode({'time': timestamp, 'prices': subset, 'failed': missing}))
+
+    def _on_new_connection(self) -> None:
+        """Track a newly attached instance"""
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self.subscriptions[socket] = Subscription()
+            # Bound slots (not lambdas) are dropped by Qt when the hub is destroyed first
+            socket.readyRead.connect(self._on_ready_read)
+            socket.disconnected.connect(self._on_disconnected)
+
+    def _on_ready_read(self) -> None:
+        """Apply subscription updates"""
+        socket = self.sender()
+        subscription = self.subscriptions.get(socket)
+        if subscription is None:
+            return
+        changed = False
+        for message in read_messages(socket):
+            symbols = set(message.get('symbols', ()))
+            held = set(message.get('held', ()))
+            if symbols != subscription.symbols or held != subscription.held:
+                subscription.symbols, subscription.held = symbols, held
+                changed = True
+        if changed:
+            self.subscriptions_changed.emit()
+
+    def _on_disconnected(self) -> None:
+        """Forget a detached instance"""
+        socket = self.sender()
+        if self.subscriptions.pop(socket, None) is not None:
+            self.subscriptions_changed.emit()
+        socket.deleteLater()
+
+
+class HubClient(QObject):
+    """Receives prices from the instance that owns the hub"""
+
+    prices_ready = pyqtSignal(dict, list, float)  # symbol -> price, failed symbols, fetch time
+    disconnected = pyqtSignal()
+
+    def __init__(self, name: str = HUB_NAME, parent=None) -> None:
+        super().__init__(parent)
+        self.name = name
+        self.socket = QLocalSocket(self)
+        self.socket.readyRead.connect(self._on_ready_read)
+        self.socket.disconnected.connect(self.disconnected)
+        self._sent: Optional[bytes] = None  # Last subscription, so unchanged ones are not resent
+
+    def connect_to_hub(self, timeout: int = CONNECT_TIMEOUT) -> bool:
+        """Attach to a running hub; False when there is none"""
+        self._sent = None
+        self.socket.connectToServer(self.name)
+        return self.socket.waitForConnected(timeout)
+
+    def is_connected(self) -> bool:
+        """Return whether the hub is attached"""
+        return self.socket.state() == QLocalSocket.ConnectedState
+
+    def set_symbols(self, symbols: List[str], held: Iterable[str] = ()) -> None:
+        """Subscribe to symbols (held ones are polled faster by the hub)"""
+        message = encode({'symbols': sorted(symbols), 'held': sorted(held)})
+        if message != self._sent and self.is_connected():
+            self.socket.write(message)
+            self._sent = message
+
+    def close(self) -> None:
+        """Detach from the hub"""
+        self.socket.disconnected.disconnect(self.disconnected)
+        self.socket.disconnectFromServer()
+
+    def _on_ready_read(self) -> None:
+        """Forward price messages"""
+        for message in read_messages(self.socket):
+            try:
+                self.prices_ready.emit({symbol: float(price) for symbol, price in message['prices'].items()},
+                                       list(message.get('failed', ())), float(message['time']))
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                print(f"Invalid hub message: {e}")
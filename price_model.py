@@ -0,0 +1,291 @@
+from typing import List, Optional
+import time
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, QPointF, Qt
+from PyQt5.QtGui import QColor, QPainter, QPen, QPolygonF
+from PyQt5.QtWidgets import QStyledItemDelegate
+
+# Cached colours
+PRICE_COLOR = QColor("#EAECEF")  # White for live prices
+STALE_COLOR = QColor("#848E9C")  # Grey for last-known prices
+PROFIT_COLOR = QColor("#00FF7F")  # Green for profit
+LOSS_COLOR = QColor("#F6465D")  # Red for loss and errors
+ALERT_COLOR = QColor(240, 185, 11, 90)  # Translucent yellow row flash for fired alerts
+
+# Columns
+NAME_COLUMN = 0
+PRICE_COLUMN = 1
+PROFIT_COLUMN = 2
+HISTORY_COLUMN = 3  # Sparkline and % change over the history window
+COLUMN_COUNT = 4
+HISTORY_ROLE = Qt.UserRole  # PriceHistory of the row
+FLASH_ROLE = Qt.UserRole + 1  # Row highlight colour, painted by the view over the cells
+
+RIGHT_ALIGNMENT = int(Qt.AlignRight)
+SPARKLINE_ALPHA = 120  # Keeps the % change text readable on top of the line
+
+
+class PriceRow:
+    """Display state of one table row; text and colours are only rebuilt when the value changes"""
+
+    __slots__ = ('symbol', 'texts', 'colors', 'tooltip', 'history', 'flash', 'stale_since', 'age')
+
+    def __init__(self, symbol: str) -> None:
+        self.symbol = symbol
+        self.texts = [symbol, '', '', '']
+        self.colors = [None, None, None, None]
+        self.tooltip = None
+        self.history = None
+        self.flash = None
+        self.stale_since = None  # Time of the last-known price while no live one arrives
+        self.age = None  # Age text shown instead of the % change while stale
+
+
+def format_price(symbol: str, price: float) -> str:
+    """Format a price the way the board shows it"""
+    if symbol == 'KRW-USD':
+        return f'{price:.2f}'
+    if symbol.startswith('KRW-'):  # KRW venues quote whole won for all but the cheapest coins
+        return f'{price:,.0f}' if price >= 100 else f'{price:.2f}'
+    return f'{price:.4f}'
+
+
+def format_age(seconds: float) -> str:
+    """Format the age of a last-known price, e.g. 45s, 12m, 3h"""
+    for limit, suffix in ((86400, 'd'), (3600, 'h'), (60, 'm')):
+        if seconds >= limit:
+            return f'{seconds // limit:.0f}{suffix}'
+    return f'{max(0.0, seconds):.0f}s'
+
+
+def format_change(change: Optional[float]) -> str:
+    """Format a % change"""
+    if change is None:
+        return ""
+    return f'{change:+.1f}%'
+
+
+def format_profit(profit: Optional[float]) -> str:
+    """Format profit with an explicit sign"""
+    if profit is None:
+        return ""  # Display empty string instead of N/A
+    profit_sign = "+" if profit >= 0 else "-"
+    return f'{profit_sign}  {abs(profit):,.2f}'
+
+
+def format_compact(value: float, signed: bool = False) -> str:
+    """Format a large amount with a K/M/B suffix for the narrow totals row"""
+    sign = ("+" if value >= 0 else "-") if signed else ("-" if value < 0 else "")
+    amount = abs(value)
+    for limit, suffix in ((1e9, 'B'), (1e6, 'M'), (1e3, 'K')):
+        if amount >= limit:
+            return f'{sign}{amount / limit:.2f}{suffix}'
+    return f'{sign}{amount:.2f}'
+
+
+class PriceTableModel(QAbstractTableModel):
+    """Price board model with fixed row storage; emits dataChanged only for cells that changed"""
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.rows: List[PriceRow] = []
+        self.row_index = {}  # symbol -> row
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else COLUMN_COUNT
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == HISTORY_COLUMN and row.age is not None:
+                return row.age
+            return row.texts[column]
+        if role == Qt.ForegroundRole:
+            if column == HISTORY_COLUMN and row.age is not None:
+                return STALE_COLOR
+            return row.colors[column]
+        if role == FLASH_ROLE:
+            return row.flash
+        if role == Qt.TextAlignmentRole and column != NAME_COLUMN:
+            return RIGHT_ALIGNMENT
+        if role == Qt.ToolTipRole and column == PRICE_COLUMN:
+            return row.tooltip
+        if role == HISTORY_ROLE and column == HISTORY_COLUMN:
+            return row.history
+        return None
+
+    def symbol_at(self, row: int) -> Optional[str]:
+        """Return the symbol shown in row"""
+        if 0 <= row < len(self.rows):
+            return self.rows[row].symbol
+        return None
+
+    def set_symbols(self, symbols: List[str]) -> None:
+        """Set the rows to symbols, keeping the state of rows that stay"""
+        if symbols == [row.symbol for row in self.rows]:
+            return
+        existing = {row.symbol: row for row in self.rows}
+        self.beginResetModel()
+        self.rows = [existing.get(symbol) or PriceRow(symbol) for symbol in symbols]
+        self.row_index = {symbol: index for index, symbol in enumerate(symbols)}
+        self.endResetModel()
+
+    def set_price(self, symbol: str, price: float, profit: Optional[float],
+                  stale_since: Optional[float] = None) -> None:
+        """Show a price and profit; stale_since marks a last-known price, greyed and shown with its age"""
+        if stale_since is None:
+            price_color = PRICE_COLOR
+            tooltip = None
+        else:
+            price_color = STALE_COLOR
+            tooltip = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stale_since))
+        if profit is None:
+            profit_color = None
+        else:
+            profit_color = PROFIT_COLOR if profit >= 0 else LOSS_COLOR
+        self._set_row(symbol, format_price(symbol, price), price_color,
+                      format_profit(profit), profit_color, tooltip)
+        self._set_stale(symbol, stale_since)
+
+    def set_error(self, symbol: str) -> None:
+        """Mark a row whose price could not be fetched"""
+        # Error is displayed in red, also in the profit column
+        self._set_row(symbol, "Error", LOSS_COLOR, "Error", None, None)
+        self._set_stale(symbol, None)
+
+    def refresh_ages(self, now: float = None) -> None:
+        """Advance the age shown on stale rows"""
+        now = time.time() if now is None else now
+        for row in self.rows:
+            if row.stale_since is not None:
+                self._set_stale(row.symbol, row.stale_since, now)
+
+    def _set_stale(self, symbol: str, stale_since: Optional[float], now: float = None) -> None:
+        """Store when the shown price was last live and repaint the age cell if its text changed"""
+        index = self.row_index.get(symbol)
+        if index is None:
+            return
+        row = self.rows[index]
+        row.stale_since = stale_since
+        if stale_since is None:
+            age = None
+        else:
+            age = format_age((time.time() if now is None else now) - stale_since)
+        if row.age != age:
+            row.age = age
+            cell = self.index(index, HISTORY_COLUMN)
+            self.dataChanged.emit(cell, cell)
+
+    def set_totals(self, symbol: str, totals) -> None:
+        """Show PortfolioTotals in the row of symbol: market value, unrealized P&L and % return"""
+        index = self.row_index.get(symbol)
+        if index is None:
+            return
+        tooltip = (f'Value {totals.value:,.2f}\nCost {totals.cost:,.2f}'
+                   f'\nUnrealized {format_profit(totals.unrealized)}\nRealized {format_profit(totals.realized)}'
+                   f'\nPriced {totals.priced}/{totals.held}')
+        self._set_row(symbol, format_compact(totals.value), PRICE_COLOR if totals.priced == totals.held else STALE_COLOR,
+                      format_compact(totals.unrealized, signed=True),
+                      PROFIT_COLOR if totals.unrealized >= 0 else LOSS_COLOR, tooltip)
+        row = self.rows[index]
+        change = totals.unrealized / totals.cost * 100 if totals.cost > 0 else None
+        text = format_change(change)
+        if row.texts[HISTORY_COLUMN] != text:
+            row.texts[HISTORY_COLUMN] = text
+            row.colors[HISTORY_COLUMN] = None if change is None else (PROFIT_COLOR if change >= 0 else LOSS_COLOR)
+            cell = self.index(index, HISTORY_COLUMN)
+            self.dataChanged.emit(cell, cell)
+
+    def set_flash(self, symbol: str, color: Optional[QColor]) -> None:
+        """Highlight a whole row (None clears it)"""
+        index = self.row_index.get(symbol)
+        if index is None or self.rows[index].flash is color:
+            return
+        self.rows[index].flash = color
+        self.dataChanged.emit(self.index(index, 0), self.index(index, COLUMN_COUNT - 1), [FLASH_ROLE])
+
+    def set_history(self, symbol: str, history) -> None:
+        """Repaint the sparkline and % change of symbol after a new history sample"""
+        index = self.row_index.get(symbol)
+        if index is None:
+            return
+        row = self.rows[index]
+        row.history = history
+        change = history.change_percent() if history is not None else None
+        row.texts[HISTORY_COLUMN] = format_change(change)
+        if change is None:
+            row.colors[HISTORY_COLUMN] = None
+        else:
+            row.colors[HISTORY_COLUMN] = PROFIT_COLOR if change >= 0 else LOSS_COLOR
+        cell = self.index(index, HISTORY_COLUMN)
+        self.dataChanged.emit(cell, cell)
+
+    def _set_row(self, symbol: str, price_text: str, price_color, profit_text: str,
+                 profit_color, tooltip) -> None:
+        """Store new cell values and notify views of the cells that changed"""
+        index = self.row_index.get(symbol)
+        if index is None:
+            return
+        row = self.rows[index]
+        first = last = None
+        for column, text, color in ((PRICE_COLUMN, price_text, price_color),
+                                    (PROFIT_COLUMN, profit_text, profit_color)):
+            if row.texts[column] != text or row.colors[column] is not color:
+                row.texts[column] = text
+                row.colors[column] = color
+                first = column if first is None else first
+                last = column
+        if row.tooltip != tooltip:
+            row.tooltip = tooltip
+            first = PRICE_COLUMN if first is None else first
+            last = PRICE_COLUMN if last is None else last
+        if first is not None:
+            self.dataChanged.emit(self.index(index, first), self.index(index, last))
+
+
+def paint_sparkline(painter: QPainter, rect, history, color: Optional[QColor], pens: dict) -> None:
+    """Draw history as a translucent line inside rect; pens caches one pen per colour"""
+    if history is None or len(history) < 2:
+        return
+    rect = rect.adjusted(3, 5, -3, -5)
+    if rect.width() < 4 or rect.height() < 2:
+        return
+
+    values = history.values()
+    low, high = min(values), max(values)
+    x_step = rect.width() / (len(values) - 1)
+    y_scale = rect.height() / (high - low) if high > low else 0
+    bottom = rect.bottom()
+    points = QPolygonF([
+        QPointF(rect.left() + i * x_step, bottom - (value - low) * y_scale)
+        for i, value in enumerate(values)
+    ])
+
+    color = color or STALE_COLOR
+    pen = pens.get(color.rgb())
+    if pen is None:
+        line_color = QColor(color)
+        line_color.setAlpha(SPARKLINE_ALPHA)
+        pen = pens[color.rgb()] = QPen(line_color, 1)
+    painter.save()
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(pen)
+    painter.drawPolyline(points)
+    painter.restore()
+
+
+class SparklineDelegate(QStyledItemDelegate):
+    """Draws the price history as a translucent line behind the % change text"""
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._pens = {}  # Cached pens per colour
+
+    def paint(self, painter, option, index) -> None:
+        super().paint(painter, option, index)  # Background, selection and % change text
+        paint_sparkline(painter, option.rect, index.data(HISTORY_ROLE), index.data(Qt.ForegroundRole), self._pens)
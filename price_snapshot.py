@@ -0,0 +1,39 @@
+from typing import Dict
+import json
+from atomic_file import write_atomic
+
+# Constants
+SNAPSHOT_FILE = 'price_snapshot.json'
+
+
+def _is_number(value) -> bool:
+    """Return whether value is an int or float (bool excluded)"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def load_snapshot(path: str = SNAPSHOT_FILE) -> Dict[str, dict]:
+    """Load last-known prices as {symbol: {'price', 'profit', 'time'}}
+
+    Entries without a numeric price and time (hand-edited or partial files) are skipped here,
+    not when their age is shown.
+    """
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return {
+            symbol: entry for symbol, entry in data.items()
+            if isinstance(entry, dict) and all(_is_number(entry.get(key)) for key in ('price', 'time'))
+        }
+    except FileNotFoundError:
+        return {}
+    except (json.JSONDecodeError, AttributeError) as e:
+        print(f"Price snapshot load error: {e}")
+        return {}
+
+
+def save_snapshot(snapshot: Dict[str, dict], path: str = SNAPSHOT_FILE) -> None:
+    """Save last-known prices atomically"""
+    try:
+        write_atomic(json.dumps(snapshot), path)
+    except OSError as e:
+        print(f"Price snapshot save error: {e}")
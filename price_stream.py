@@ -0,0 +1,193 @@
+from typing import Dict, List, Optional
+import json
+import time
+from PyQt5.QtCore import QObject, QTimer, QUrl, pyqtSignal
+from PyQt5.QtNetwork import QAbstractSocket
+from PyQt5.QtWebSockets import QWebSocket
+
+# Constants
+BINANCE_STREAM_URL = "wss://stream.binance.com:9443/stream"
+STREAM_CHANNEL = "miniTicker"  # or "bookTicker" for best bid/ask mid price
+FLUSH_INTERVAL = 16  # ms, at most one table update per frame
+RECONNECT_DELAY = 1000  # ms, doubled after every failed attempt
+MAX_RECONNECT_DELAY = 30000  # ms
+WATCHDOG_INTERVAL = 5000  # ms between liveness checks (each sends a ping) on an open connection
+STALL_TIMEOUT = 15.0  # seconds without any frame or pong before a connection counts as dead (half-open)
+SYMBOL_STALL_TIMEOUT = 30.0  # seconds without an update before a symbol is polled again
+
+
+class PriceStream(QObject):
+    """Streams live prices from Binance's combined WebSocket stream"""
+
+    prices_ready = pyqtSignal(dict)  # symbol -> price, merged per frame
+    connected = pyqtSignal()
+    disconnected = pyqtSignal()
+
+    def __init__(self, url: str = BINANCE_STREAM_URL, channel: str = STREAM_CHANNEL, parent=None) -> None:
+        super().__init__(parent)
+        self.url = url
+        self.channel = channel
+        self.symbols: List[str] = []
+        self._subscribed = set()  # Stream names active on the current connection
+        self._pending: Dict[str, float] = {}  # Updates waiting for the next flush
+        self._request_id = 0
+        self._running = False
+        self._is_connected = False
+        self._reconnect_delay = RECONNECT_DELAY
+        self._last_activity = 0.0  # monotonic time of the last frame or pong
+        self._last_update: Dict[str, float] = {}  # symbol -> monotonic time of its last price (or subscription)
+
+        self.socket = QWebSocket()
+        self.socket.setParent(self)
+        self.socket.connected.connect(self._on_connected)
+        self.socket.disconnected.connect(self._on_disconnected)
+        self.socket.textMessageReceived.connect(self._on_message)
+        self.socket.error.connect(self._on_error)
+        self.socket.pong.connect(self._on_pong)
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._flush)
+
+        self._reconnect_timer = QTimer(self)
+        self._reconnect_timer.setSingleShot(True)
+        self._reconnect_timer.timeout.connect(self._open)
+
+        # A silent socket can still report "connected" (half-open TCP): pings and message times expose it
+        self._watchdog = QTimer(self)
+        self._watchdog.timeout.connect(self._check_alive)
+
+    def is_connected(self) -> bool:
+        """Return whether the stream is currently delivering prices"""
+        return self._is_connected
+
+    def is_streaming(self, coin: str) -> bool:
+        """Return whether coin's price currently arrives over the stream; otherwise it has to be polled"""
+        if not self._is_connected or self.stream_name(coin) is None:
+            return False
+        last = self._last_update.get(coin)
+        return last is not None and time.monotonic() - last < SYMBOL_STALL_TIMEOUT
+
+    def stream_name(self, coin: str) -> Optional[str]:
+        """Return stream name for coin, or None if it cannot be streamed"""
+        if '-' in coin:
+            return None  # FX pairs and KRW-venue markets are not Binance symbols, always polled
+        return f'{coin.lower()}@{self.channel}'
+
+    def start(self) -> None:
+        """Connect and keep reconnecting until stop() is called"""
+        if self._running:
+            return
+        self._running = True
+        self._open()
+
+    def stop(self) -> None:
+        """Close the connection without reconnecting"""
+        self._running = False
+        self._reconnect_timer.stop()
+        self._watchdog.stop()
+        self.socket.close()
+
+    def set_symbols(self, symbols: List[str]) -> None:
+        """Subscribe to added symbols and unsubscribe from removed ones"""
+        self.symbols = list(symbols)
+        if self._is_connected:
+            self._sync_subscriptions()
+
+    def _open(self) -> None:
+        """Open the WebSocket connection"""
+        if self._running:
+            self.socket.open(QUrl(self.url))
+
+    def _on_connected(self) -> None:
+        """Subscribe to every selected symbol on a fresh connection"""
+        self._is_connected = True
+        self._reconnect_delay = RECONNECT_DELAY
+        self._subscribed = set()
+        self._last_activity = time.monotonic()
+        self._sync_subscriptions()
+        self._watchdog.start(WATCHDOG_INTERVAL)
+        self.connected.emit()
+
+    def _on_disconnected(self) -> None:
+        """Schedule a reconnect with exponential backoff"""
+        was_connected = self._is_connected
+        self._is_connected = False
+        self._subscribed = set()
+        self._last_update.clear()
+        self._watchdog.stop()
+        if was_connected:
+            self.disconnected.emit()
+        if self._running and not self._reconnect_timer.isActive():
+            self._reconnect_timer.start(self._reconnect_delay)
+            self._reconnect_delay = min(self._reconnect_delay * 2, MAX_RECONNECT_DELAY)
+
+    def _on_error(self, error) -> None:
+        """Treat a failed connection attempt like a disconnect"""
+        print(f"Price stream error: {self.socket.errorString()}")
+        if self.socket.state() != QAbstractSocket.ConnectedState:
+            self._on_disconnected()
+
+    def _on_pong(self, elapsed: int, payload: bytes) -> None:
+        """A pong proves the connection is alive even when no prices move"""
+        self._last_activity = time.monotonic()
+
+    def _check_alive(self) -> None:
+        """Drop a connection that stopped answering and ping a live one"""
+        idle = time.monotonic() - self._last_activity
+        if idle > STALL_TIMEOUT:
+            print(f"Price stream stalled ({idle:.0f}s silent), reconnecting")
+            self.socket.abort()
+            self._on_disconnected()  # Polling covers every symbol until the new connection delivers
+            return
+        self.socket.ping()
+
+    def _sync_subscriptions(self) -> None:
+        """Send SUBSCRIBE/UNSUBSCRIBE for the difference to the selected symbols"""
+        wanted = {stream for stream in map(self.stream_name, self.symbols) if stream}
+        added = sorted(wanted - self._subscribed)
+        removed = sorted(self._subscribed - wanted)
+        if removed:
+            self._send('UNSUBSCRIBE', removed)
+        if added:
+            self._send('SUBSCRIBE', added)
+            now = time.monotonic()
+            for coin in self.symbols:
+                if self.stream_name(coin) in added:
+                    self._last_update[coin] = now  # Grace period until the first event arrives
+        self._subscribed = wanted
+
+    def _send(self, method: str, params: List[str]) -> None:
+        """Send a subscription request"""
+        self._request_id += 1
+        self.socket.sendTextMessage(json.dumps({'method': method, 'params': params, 'id': self._request_id}))
+
+    def _on_message(self, message: str) -> None:
+        """Parse a stream event and queue it for the next flush"""
+        self._last_activity = time.monotonic()
+        try:
+            payload = json.loads(message)
+            data = payload.get('data', payload)  # Combined streams wrap events in {"stream", "data"}
+            symbol = data.get('s')
+            if not symbol:
+                return  # Subscription acknowledgement
+            if 'c' in data:  # miniTicker close price
+                price = float(data['c'])
+            elif 'b' in data and 'a' in data:  # bookTicker mid price
+                price = (float(data['b']) + float(data['a'])) / 2
+            else:
+                return
+        except (ValueError, TypeError, AttributeError) as e:
+            print(f"Invalid stream message: {e}")
+            return
+
+        self._pending[symbol] = price
+        self._last_update[symbol] = self._last_activity
+        if not self._flush_timer.isActive():
+            self._flush_timer.start(FLUSH_INTERVAL)
+
+    def _flush(self) -> None:
+        """Emit all updates received since the last flush"""
+        if self._pending:
+            prices, self._pending = self._pending, {}
+            self.prices_ready.emit(prices)
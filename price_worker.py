@@ -0,0 +1,59 @@
+from typing import List
+from concurrent.futures import ThreadPoolExecutor
+import time
+from PyQt5.QtCore import QObject, pyqtSignal, Qt
+from price_engine import PriceEngine, PriceSnapshot
+
+
+class PriceWorker(QObject):
+    """Runs PriceEngine ticks off the GUI thread and reports back through queued signals"""
+
+    snapshot_ready = pyqtSignal(object)  # PriceSnapshot
+    _finished = pyqtSignal(object)
+
+    def __init__(self, engine: PriceEngine, parent=None) -> None:
+        super().__init__(parent)
+        self.engine = engine
+        self._executor = ThreadPoolExecutor(max_workers=1)  # The engine fans out per source
+        self._busy = False
+        self._closed = False
+        # Results are produced on a pool thread; hop back to the GUI thread before touching state
+        self._finished.connect(self._on_finished, Qt.QueuedConnection)
+
+    def is_busy(self) -> bool:
+        """Return whether a fetch is still running"""
+        return self._busy
+
+    def request(self, coins: List[str]) -> bool:
+        """Start a fetch for coins; the tick is dropped if the previous one is still running"""
+        if self._busy or not coins:
+            return False
+        self._busy = True
+        self._executor.submit(self._run, list(coins))
+        return True
+
+    def shutdown(self) -> None:
+        """Stop accepting work"""
+        self._closed = True
+        self._executor.shutdown(wait=False)
+        self.engine.close()
+
+    def _run(self, coins: List[str]) -> None:
+        """Run one engine tick (runs on a pool thread)"""
+        try:
+            snapshot = self.engine.tick(coins)
+        except Exception as e:
+            if self._closed:
+                return  # Engine was closed while the app is closing
+            # Report every coin as failed so the busy flag is released and polling goes on
+            print(f"Price tick error: {e}")
+            snapshot = PriceSnapshot({}, set(coins), time.time(), 0.0)
+        try:
+            self._finished.emit(snapshot)
+        except RuntimeError:
+            pass  # Worker was deleted while the fetch was in flight
+
+    def _on_finished(self, snapshot: PriceSnapshot) -> None:
+        """Release the busy flag and forward results (runs on the GUI thread)"""
+        self._busy = False
+        self.snapshot_ready.emit(snapshot)
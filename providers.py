@@ -0,0 +1,316 @@
+from typing import Dict, List, Optional, Tuple, Type
+from urllib.parse import quote
+import json
+import threading
+import time
+from circuit_breaker import CircuitBreaker
+from http_client import client, HttpError, is_client_error
+
+# Constants
+BINANCE_API_BASE = "https://api.binance.com/api/v3"
+UPBIT_API_BASE = "https://api.upbit.com/v1"
+FX_API_URL = "https://api.exchangerate-api.com/v4/latest/USD"
+MAX_BATCH_SYMBOLS = 100  # Larger watchlists fetch the full ticker list instead of a huge symbols=[...] URL
+UPBIT_BATCH_SYMBOLS = 100  # Markets per Upbit ticker request
+FX_CACHE_TTL = 60 * 60  # seconds, the FX provider only publishes about once a day
+FX_RETRY_INTERVAL = 60  # seconds before a failed FX refresh is tried again
+FX_PAIRS = {'KRW-USD': 'KRW'}  # Rows served from the USD rates table
+QUOTE_ASSETS = ('USDT', 'FDUSD', 'USDC', 'BTC', 'ETH', 'BNB')  # Binance quote assets, for trading-page URLs
+REJECTED_SYMBOL_TTL = 60 * 60  # seconds a symbol the exchange rejected stays out of batches
+KLINE_LIMIT = 500  # Candles per klines request (Binance allows up to 1000)
+FETCH_ERRORS = (HttpError, ValueError, KeyError, TypeError, AttributeError)
+
+# name -> provider class, filled by @register_provider
+PROVIDERS: Dict[str, Type['PriceSource']] = {}
+
+
+def register_provider(cls: Type['PriceSource']) -> Type['PriceSource']:
+    """Class decorator that makes a provider selectable by name"""
+    PROVIDERS[cls.name] = cls
+    return cls
+
+
+class PriceSource:
+    """Base class of a pluggable price provider"""
+
+    name = 'source'
+    priority = 100  # Lower routes first; catch-all providers go last
+    max_connections = 1  # Concurrent requests this provider allows from us
+    batch_size: Optional[int] = None  # Symbols per request, None for a single request
+    has_klines = False  # Whether klines() can chart this provider's symbols
+
+    def __init__(self) -> None:
+        self.connections = threading.BoundedSemaphore(self.max_connections)
+        self.breaker = CircuitBreaker(self.name)  # Trips on failed price fetches, whatever the endpoint
+        self.rejected: Dict[str, float] = {}  # symbol -> time the exchange rejected it as unknown
+
+    @property
+    def endpoint(self) -> str:
+        """Batch price endpoint"""
+        return ''
+
+    def handles(self, symbol: str) -> bool:
+        """Return whether this source prices symbol"""
+        raise NotImplementedError
+
+    def is_cached(self, symbols: List[str]) -> bool:
+        """Return whether fetch() can answer without network I/O"""
+        return False
+
+    def accepted(self, symbols: List[str]) -> List[str]:
+        """Return symbols without the ones rejected within REJECTED_SYMBOL_TTL (they then count as failed)"""
+        if not self.rejected:
+            return symbols
+        now = time.time()
+        return [symbol for symbol in symbols if now - self.rejected.get(symbol, 0) >= REJECTED_SYMBOL_TTL]
+
+    def reject(self, symbols) -> None:
+        """Keep symbols the exchange does not know out of later batches"""
+        for symbol in symbols:
+            print(f"{self.name} rejected {symbol}, leaving it out for {REJECTED_SYMBOL_TTL // 60} min")
+            self.rejected[symbol] = time.time()
+
+    def price_time(self) -> Optional[float]:
+        """Return when the prices of the last fetch() were published, None when they are live"""
+        return None
+
+    def batches(self, symbols: List[str]) -> List[List[str]]:
+        """Split symbols into the requests one tick needs"""
+        if not self.batch_size:
+            return [symbols]
+        return [symbols[i:i + self.batch_size] for i in range(0, len(symbols), self.batch_size)]
+
+    def fetch(self, symbols: List[str]) -> Dict[str, float]:
+        """Return prices for symbols; raises on failure"""
+        raise NotImplementedError
+
+    def list_symbols(self, validators: dict) -> Tuple[Optional[List[str]], dict]:
+        """Return (symbols offered for search or None when unchanged, cache validators)"""
+        return [], {}
+
+    def trading_url(self, symbol: str) -> Optional[str]:
+        """Return the web page to trade or chart symbol"""
+        return None
+
+    def klines(self, symbol: str, interval: str, start_time: Optional[float] = None,
+               limit: int = KLINE_LIMIT) -> List[Tuple[float, ...]]:
+        """Return candles (open time ms, open, high, low, close, volume) from start_time on (the latest
+        candles when None), oldest first; raises on failure"""
+        raise NotImplementedError
+
+
+@register_provider
+class FxSource(PriceSource):
+    """FX rows such as KRW-USD from the shared rates table"""
+
+    name = 'fx'
+    priority = 0
+
+    def __init__(self, rates: 'FxRateCache' = None) -> None:
+        super().__init__()
+        self.rates = rates or fx_rates
+
+    @property
+    def endpoint(self) -> str:
+        return self.rates.url or FX_API_URL
+
+    def handles(self, symbol: str) -> bool:
+        return symbol in FX_PAIRS
+
+    def is_cached(self, symbols: List[str]) -> bool:
+        return not self.rates.can_refresh()  # Fresh, or waiting out a failed refresh (fetch raises at once)
+
+    def price_time(self) -> Optional[float]:
+        return self.rates.fetched_at  # The rows age with the table, not with the poll
+
+    def fetch(self, symbols: List[str]) -> Dict[str, float]:
+        rates = self.rates.get_rates()
+        return {pair: rates[FX_PAIRS[pair]] for pair in symbols}
+
+    def list_symbols(self, validators: dict) -> Tuple[Optional[List[str]], dict]:
+        return list(FX_PAIRS), {}
+
+    def trading_url(self, symbol: str) -> Optional[str]:
+        currency = FX_PAIRS.get(symbol)
+        return f'https://www.tradingview.com/chart/?symbol=FX_IDC%3AUSD{currency}' if currency else None
+
+
+@register_provider
+class UpbitSource(PriceSource):
+    """Upbit KRW markets (symbols like KRW-BTC)"""
+
+    name = 'upbit'
+    priority = 10
+    max_connections = 2  # Upbit allows about 10 quotation requests per second
+    batch_size = UPBIT_BATCH_SYMBOLS
+
+    def __init__(self, api_base: str = None) -> None:
+        super().__init__()
+        self.api_base = api_base  # None uses UPBIT_API_BASE
+
+    @property
+    def endpoint(self) -> str:
+        return f'{self.api_base or UPBIT_API_BASE}/ticker'
+
+    def handles(self, symbol: str) -> bool:
+        return '-' in symbol and symbol not in FX_PAIRS
+
+    def fetch(self, symbols: List[str]) -> Dict[str, float]:
+        symbols = self.accepted(symbols)
+        if not symbols:
+            return {}
+        try:
+            data = client.get_json(self.endpoint, params={'markets': ','.join(symbols)})
+        except HttpError as e:
+            if not is_client_error(e):
+                raise
+            if len(symbols) == 1:
+                self.reject(symbols)
+                raise
+            # Upbit rejects the whole batch (404) for one unknown market: split it so only that market fails
+            middle = len(symbols) // 2
+            prices = {}
+            for half in (symbols[:middle], symbols[middle:]):
+                try:
+                    prices.update(self.fetch(half))
+                except HttpError as half_error:
+                    if not is_client_error(half_error):
+                        raise
+            return prices
+        return {item['market']: float(item['trade_price']) for item in data}
+
+    def list_symbols(self, validators: dict) -> Tuple[Optional[List[str]], dict]:
+        data = client.get_json(f'{self.api_base or UPBIT_API_BASE}/market/all')
+        return [item['market'] for item in data if item['market'].startswith('KRW-')], {}
+
+    def trading_url(self, symbol: str) -> Optional[str]:
+        return f'https://upbit.com/exchange?code=CRIX.UPBIT.{quote(symbol)}'
+
+
+@register_provider
+class BinanceSource(PriceSource):
+    """Binance spot prices, one batched ticker request per tick"""
+
+    name = 'binance'
+    priority = 90  # Catch-all for plain symbols such as BTCUSDT
+    has_klines = True
+
+    def __init__(self, api_base: str = None) -> None:
+        super().__init__()
+        self.api_base = api_base  # None uses BINANCE_API_BASE
+
+    @property
+    def endpoint(self) -> str:
+        return f'{self.api_base or BINANCE_API_BASE}/ticker/price'
+
+    def handles(self, symbol: str) -> bool:
+        return '-' not in symbol
+
+    def fetch(self, symbols: List[str]) -> Dict[str, float]:
+        url = self.endpoint
+        symbols = self.accepted(symbols)
+        if not symbols:
+            return {}
+        rejected = False
+        if len(symbols) > MAX_BATCH_SYMBOLS:
+            data = client.get_json(url)  # Every symbol, filtered below
+        else:
+            try:
+                data = client.get_json(url, params={'symbols': json.dumps(symbols, separators=(',', ':'))})
+            except HttpError as e:
+                if not is_client_error(e):
+                    raise
+                # One unknown or delisted symbol rejects the whole batch (400, -1121): filter the full list
+                # instead, so only the missing symbols fail
+                data = client.get_json(url)
+                rejected = True
+        wanted = set(symbols)
+        prices = {item['symbol']: float(item['price']) for item in data if item['symbol'] in wanted}
+        if rejected:
+            self.reject(wanted - set(prices))  # Later batches go out without them
+        return prices
+
+    def list_symbols(self, validators: dict) -> Tuple[Optional[List[str]], dict]:
+        """Download exchangeInfo and keep USDT symbols, revalidating with ETag/Last-Modified"""
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+
+        response = client.get(f'{self.api_base or BINANCE_API_BASE}/exchangeInfo', headers=headers)
+        validators = {
+            'etag': response.headers.get('ETag', validators.get('etag')),
+            'last_modified': response.headers.get('Last-Modified', validators.get('last_modified'))
+        }
+        if response.status_code == 304:
+            return None, validators
+        return [symbol['symbol'] for symbol in response.json()['symbols'] if 'USDT' in symbol['symbol']], validators
+
+    def klines(self, symbol: str, interval: str, start_time: Optional[float] = None,
+               limit: int = KLINE_LIMIT) -> List[Tuple[float, ...]]:
+        params = {'symbol': symbol, 'interval': interval, 'limit': limit}
+        if start_time is not None:
+            params['startTime'] = int(start_time)
+        data = client.get_json(f'{self.api_base or BINANCE_API_BASE}/klines', params=params)
+        return [tuple(float(value) for value in kline[:6]) for kline in data]
+
+    def trading_url(self, symbol: str) -> Optional[str]:
+        for quote_asset in QUOTE_ASSETS:
+            if symbol.endswith(quote_asset) and len(symbol) > len(quote_asset):
+                return f'https://www.binance.com/en/trade/{symbol[:-len(quote_asset)]}_{quote_asset}'
+        return f'https://www.binance.com/en/trade/{symbol}'
+
+
+class FxRateCache:
+    """USD exchange-rate table shared by all FX rows and refreshed on its own TTL"""
+
+    def __init__(self, ttl: float = FX_CACHE_TTL, url: str = None) -> None:
+        self.ttl = ttl
+        self.url = url  # None uses FX_API_URL
+        self.rates: Dict[str, float] = {}
+        self.fetched_at = 0.0
+        self.retry_at = 0.0  # No download before this time after a failed refresh
+        self._lock = threading.Lock()
+
+    def is_fresh(self) -> bool:
+        """Return whether the cached table is within its TTL"""
+        return bool(self.rates) and time.time() - self.fetched_at < self.ttl
+
+    def can_refresh(self) -> bool:
+        """Return whether the table needs a download and no failed refresh is being waited out"""
+        return not self.is_fresh() and time.time() >= self.retry_at
+
+    def get_rates(self) -> Dict[str, float]:
+        """Return the rates table, downloading it only when the TTL has expired; raises while it is expired
+
+        Rows then fall back to their last-known rate, greyed with its age, until a refresh succeeds.
+        """
+        with self._lock:  # Concurrent callers share one download
+            if self.can_refresh():
+                try:
+                    data = client.get_json(self.url or FX_API_URL)
+                    self.rates = {currency: float(rate) for currency, rate in data['rates'].items()}
+                    self.fetched_at = time.time()
+                except FETCH_ERRORS:
+                    self.retry_at = time.time() + FX_RETRY_INTERVAL  # Not again on every poll
+                    raise
+            if not self.is_fresh():
+                raise HttpError(f"FX rates expired, next refresh in {max(0.0, self.retry_at - time.time()):.0f}s")
+            return self.rates
+
+
+# Shared by every row that needs an FX rate
+fx_rates = FxRateCache()
+
+
+def create_sources(names: List[str] = None) -> List[PriceSource]:
+    """Instantiate the named providers (all registered ones by default) in routing order"""
+    selected = []
+    for name in names if names is not None else list(PROVIDERS):
+        provider = PROVIDERS.get(name)
+        if provider is None:
+            print(f"Unknown price provider: {name}")
+            continue
+        selected.append(provider())
+    return sorted(selected, key=lambda source: source.priority)
@@ -0,0 +1,104 @@
+from typing import Dict, Iterable, List, Set
+import time
+
+# Constants
+HELD_INTERVAL = 2.5  # seconds between polls of symbols with open lots in the portfolio
+WATCH_INTERVAL = 10.0  # seconds between polls of watch-only symbols
+PIGGYBACK_WINDOW = 1.5  # seconds; symbols due this soon join a request that goes out anyway
+MAX_ERROR_BACKOFF = 120.0  # seconds, longest interval after repeated failures
+WEIGHT_LIMIT = 6000  # Binance request weight allowed per minute and IP
+WEIGHT_BUDGET_SHARE = 0.5  # Share of the limit we allow ourselves (other desks share the NAT IP)
+WEIGHT_SLOWDOWN_START = 0.7  # Budget share above which intervals start stretching
+MAX_WEIGHT_SLOWDOWN = 4.0  # Interval multiplier at a full budget
+
+
+class PollScheduler:
+    """Per-symbol poll cadence that respects Binance's request-weight budget and backs off on errors"""
+
+    def __init__(self, held_interval: float = HELD_INTERVAL, watch_interval: float = WATCH_INTERVAL,
+                 weight_limit: int = WEIGHT_LIMIT, budget_share: float = WEIGHT_BUDGET_SHARE) -> None:
+        self.held_interval = held_interval
+        self.watch_interval = watch_interval
+        self.weight_budget = weight_limit * budget_share
+        self.held: Set[str] = set()
+        self.next_due: Dict[str, float] = {}
+        self.failures: Dict[str, int] = {}
+        self.weighted: Set[str] = set()  # Symbols whose polls count toward the weight budget
+        self.used_weight = 0
+        self.weight_window = 0  # Minute (epoch // 60) that used_weight was reported for
+        self.blocked_until = 0.0  # Set when the weight budget is exhausted; holds back weighted symbols only
+
+    def set_symbols(self, symbols: Iterable[str], held: Set[str], weighted: Set[str] = None) -> None:
+        """Track symbols; new ones are due immediately. weighted defaults to all symbols"""
+        symbols = list(symbols)
+        self.held = set(held)
+        self.weighted = set(symbols) if weighted is None else set(weighted)
+        for symbol in symbols:
+            self.next_due.setdefault(symbol, 0.0)
+        for symbol in set(self.next_due) - set(symbols):
+            del self.next_due[symbol]
+            self.failures.pop(symbol, None)
+
+    def interval(self, symbol: str) -> float:
+        """Return the current poll interval of symbol"""
+        base = self.held_interval if symbol in self.held else self.watch_interval
+        backoff = 2 ** self.failures.get(symbol, 0)
+        slowdown = self.slowdown() if symbol in self.weighted else 1.0
+        return min(base * backoff, MAX_ERROR_BACKOFF) * slowdown
+
+    def current_weight(self, now: float = None) -> int:
+        """Return the reported weight if it belongs to the current minute, else 0"""
+        now = time.time() if now is None else now
+        return self.used_weight if self.weight_window == now // 60 else 0
+
+    def slowdown(self, now: float = None) -> float:
+        """Interval multiplier derived from the weight reported for the current minute"""
+        pressure = self.current_weight(now) / self.weight_budget
+        if pressure <= WEIGHT_SLOWDOWN_START:
+            return 1.0
+        share = min(1.0, (pressure - WEIGHT_SLOWDOWN_START) / (1 - WEIGHT_SLOWDOWN_START))
+        return 1.0 + share * (MAX_WEIGHT_SLOWDOWN - 1.0)
+
+    def due(self, now: float = None) -> List[str]:
+        """Return symbols that should be polled now"""
+        now = time.time() if now is None else now
+        pending = self.next_due
+        if now < self.blocked_until:
+            # Only the weight budget is exhausted; other providers keep their cadence
+            pending = {symbol: due for symbol, due in pending.items() if symbol not in self.weighted}
+        if not any(due <= now for due in pending.values()):
+            return []
+        # A batch request costs the same weight for one symbol or many, so nearly-due symbols ride along
+        return [symbol for symbol, due in pending.items() if due <= now + PIGGYBACK_WINDOW]
+
+    def mark_requested(self, symbols: Iterable[str], now: float = None) -> None:
+        """Schedule the next poll of symbols that were just requested"""
+        now = time.time() if now is None else now
+        for symbol in symbols:
+            if symbol in self.next_due:
+                self.next_due[symbol] = now + self.interval(symbol)
+
+    def record_success(self, symbols: Iterable[str]) -> None:
+        """Reset the error backoff of symbols"""
+        for symbol in symbols:
+            self.failures.pop(symbol, None)
+
+    def record_failure(self, symbols: Iterable[str], now: float = None) -> None:
+        """Back off symbols that failed"""
+        now = time.time() if now is None else now
+        for symbol in symbols:
+            if symbol in self.next_due:
+                self.failures[symbol] = min(self.failures.get(symbol, 0) + 1, 6)
+                self.next_due[symbol] = now + self.interval(symbol)
+
+    def observe_weight(self, used_weight: int, measured_at: float, now: float = None) -> None:
+        """Take the X-MBX-USED-WEIGHT-1M value of the Binance response received at measured_at"""
+        now = time.time() if now is None else now
+        window = measured_at // 60
+        if window != now // 60:
+            return  # Binance counts weight per minute; a reading from an earlier minute says nothing now
+        self.used_weight = used_weight
+        self.weight_window = window
+        if used_weight >= self.weight_budget:
+            # Wait for the next window
+            self.blocked_until = (window + 1) * 60
@@ -0,0 +1,48 @@
+from typing import List, Tuple
+import time
+from metrics import metrics
+
+
+class StartupProfile:
+    """Wall-clock time of each startup phase, from the first import to the first paint"""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()  # Zero point: when this module was imported
+        self.last = self.started
+        self.phases: List[Tuple[str, float]] = []
+        self.finished = False
+        self.verbose = False  # Print the report when the first paint ends the profile
+
+    def mark(self, phase: str) -> None:
+        """End phase; it started where the previous phase ended"""
+        if self.finished:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        metrics.set_gauge('startup_phase_seconds', now - self.last, phase=phase)
+        self.last = now
+
+    def finish(self, phase: str = 'first_paint') -> None:
+        """End the last phase and the profile"""
+        if self.finished:
+            return
+        self.mark(phase)
+        self.finished = True
+        metrics.set_gauge('startup_seconds', self.total())
+        if self.verbose:
+            print(self.report())
+
+    def total(self) -> float:
+        """Return seconds from the zero point to the end of the last phase"""
+        return self.last - self.started
+
+    def report(self) -> str:
+        """Return one line per phase with its duration and share"""
+        total = self.total() or 1.0
+        lines = [f"{phase:<14} {seconds * 1000:8.1f} ms {seconds / total * 100:5.1f}%" for phase, seconds in self.phases]
+        lines.append(f"{'total':<14} {self.total() * 1000:8.1f} ms")
+        return "Startup profile\n" + "\n".join(lines)
+
+
+# Shared profile, imported first by bitcoin_live
+profile = StartupProfile()
@@ -0,0 +1,129 @@
+from typing import List
+import json
+import threading
+import time
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal, Qt
+from providers import PriceSource, FETCH_ERRORS
+from atomic_file import write_atomic
+
+# Constants
+SYMBOL_CACHE_FILE = 'symbols_cache.json'
+SYMBOL_CACHE_TTL = 24 * 60 * 60  # seconds
+SYMBOL_CHECK_INTERVAL = 60 * 60 * 1000  # ms, how often a running app checks the TTL
+
+
+class SymbolCache(QObject):
+    """On-disk cache of every provider's symbol list, revalidated in the background"""
+
+    symbols_ready = pyqtSignal(list)
+    _fetched = pyqtSignal(dict)
+
+    def __init__(self, sources: List[PriceSource], parent=None, path: str = SYMBOL_CACHE_FILE,
+                 ttl: float = SYMBOL_CACHE_TTL) -> None:
+        super().__init__(parent)
+        self.sources = sources
+        self.path = path
+        self.ttl = ttl
+        # providers: name -> {'symbols': [...], 'fetched_at': time, plus cache validators such as etag}
+        self.data = {'providers': {}}
+        self._refreshing = False
+        self._fetched.connect(self._on_fetched, Qt.QueuedConnection)
+
+        # Long-running sessions revalidate once the TTL expires
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh_if_stale)
+        self._timer.start(SYMBOL_CHECK_INTERVAL)
+
+    def load(self) -> List[str]:
+        """Return cached symbols (empty if there is no usable cache)"""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if isinstance(data.get('providers'), dict):
+                providers = data['providers']
+            elif isinstance(data.get('symbols'), list):  # Older single-list Binance cache
+                providers = {'binance': {key: data.get(key) for key in ('symbols', 'etag', 'last_modified')}}
+            else:
+                providers = {}
+            # A malformed entry is dropped on its own; that provider is listed again
+            valid = {name: entry for name, entry in providers.items()
+                     if isinstance(entry, dict) and isinstance(entry.get('symbols'), list)}
+            for name in set(providers) - set(valid):
+                print(f"Symbol cache: ignoring malformed entry {name}")
+            # Older caches kept one fetched_at for every provider
+            fetched_at = data.get('fetched_at', 0)
+            for entry in valid.values():
+                if not isinstance(entry.get('fetched_at'), (int, float)):
+                    entry['fetched_at'] = fetched_at if isinstance(fetched_at, (int, float)) else 0
+            self.data['providers'] = valid
+        except FileNotFoundError:
+            pass  # First run, fetched in the background
+        except (json.JSONDecodeError, AttributeError) as e:
+            print(f"Symbol cache load error: {e}")
+        return self.symbols()
+
+    def symbols(self) -> List[str]:
+        """Return all cached symbols in provider routing order"""
+        symbols = []
+        for source in self.sources:
+            symbols.extend(self.data['providers'].get(source.name, {}).get('symbols') or [])
+        return symbols
+
+    def stale_sources(self) -> List[PriceSource]:
+        """Return providers whose list is missing (added, or never listed successfully) or older than the TTL"""
+        now = time.time()
+        return [source for source in self.sources
+                if now - self.data['providers'].get(source.name, {}).get('fetched_at', 0) > self.ttl]
+
+    def is_stale(self) -> bool:
+        """Return whether any provider's list needs refreshing"""
+        return bool(self.stale_sources())
+
+    def refresh_if_stale(self) -> None:
+        """Revalidate the symbol list on a background thread when the TTL has expired"""
+        if self.is_stale() and not self._refreshing:
+            self._refreshing = True
+            threading.Thread(target=self._run, args=(self.stale_sources(),), daemon=True).start()
+
+    def _run(self, sources: List[PriceSource]) -> None:
+        """Fetch the symbol lists of sources (runs on a background thread)"""
+        result = {}
+        for source in sources:
+            cached = self.data['providers'].get(source.name, {})
+            # Validators are only useful while we still hold the list they describe
+            validators = {key: value for key, value in cached.items()
+                          if key not in ('symbols', 'fetched_at')} if cached.get('symbols') else {}
+            try:
+                symbols, validators = source.list_symbols(validators)
+            except FETCH_ERRORS as e:
+                print(f"Failed to load coin list from {source.name}: {e}")
+                continue
+            result[source.name] = dict(validators, symbols=symbols)  # symbols is None when unchanged
+        try:
+            self._fetched.emit(result)
+        except RuntimeError:
+            pass  # Cache was deleted while the fetch was in flight
+
+    def _on_fetched(self, result: dict) -> None:
+        """Store fresh symbol lists; only providers that answered are marked fetched (runs on the GUI thread)"""
+        self._refreshing = False
+        if not result:
+            return
+        before = self.symbols()
+        now = time.time()
+        for name, entry in result.items():
+            if entry['symbols'] is None:
+                entry['symbols'] = self.data['providers'].get(name, {}).get('symbols', [])
+            entry['fetched_at'] = now
+            self.data['providers'][name] = entry
+        self.save()
+        symbols = self.symbols()
+        if symbols != before:
+            self.symbols_ready.emit(symbols)
+
+    def save(self) -> None:
+        """Write the cache file atomically"""
+        try:
+            write_atomic(json.dumps(self.data), self.path)
+        except OSError as e:
+            print(f"Symbol cache save error: {e}")
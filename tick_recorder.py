@@ -0,0 +1,156 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+import mmap
+import os
+import struct
+import sys
+import time
+
+# Constants
+MAGIC = b'TICKREC1'  # File header, also the format version
+SYMBOL_SIZE = 20  # bytes; longer symbols cannot be recorded
+RECORD = struct.Struct(f'<dd{SYMBOL_SIZE}s')  # timestamp, price, symbol (UTF-8, NUL padded)
+FLUSH_INTERVAL = 1.0  # seconds between flushes of buffered records
+
+
+class TickRecorder:
+    """Appends price updates to a binary file of fixed-width records in non-decreasing time order"""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, 'a+b')
+        self._last_time = 0.0  # Poll and stream snapshots interleave, so timestamps are clamped to this
+        self._skipped = set()  # Symbols too long for the record, reported once
+        self._file.seek(0, os.SEEK_END)
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        else:
+            self._check_header()
+            self._truncate_partial()
+            self._last_time = self._read_last_time()
+        self._last_flush = time.monotonic()
+        self.count = 0
+
+    def _check_header(self) -> None:
+        """Refuse to touch a file that is not a tick recording"""
+        self._file.seek(0)
+        header = self._file.read(len(MAGIC))
+        self._file.seek(0, os.SEEK_END)
+        if header != MAGIC:
+            self._file.close()
+            raise ValueError(f"{self.path} is not a tick recording")
+
+    def _truncate_partial(self) -> None:
+        """Drop a torn record left by a crash so new records stay aligned"""
+        size = self._file.tell()
+        extra = (size - len(MAGIC)) % RECORD.size
+        if extra:
+            self._file.truncate(size - extra)
+            self._file.seek(0, os.SEEK_END)
+
+    def _read_last_time(self) -> float:
+        """Return the timestamp of the last record already in the file (0 if there is none)"""
+        size = self._file.tell()
+        if size < len(MAGIC) + RECORD.size:
+            return 0.0
+        self._file.seek(size - RECORD.size)
+        timestamp = struct.unpack('<d', self._file.read(8))[0]
+        self._file.seek(0, os.SEEK_END)
+        return timestamp
+
+    def record(self, prices: Dict[str, float], timestamp: float) -> None:
+        """Append one record per symbol, stamped no earlier than the previous record"""
+        timestamp = self._last_time = max(timestamp, self._last_time)
+        pack = RECORD.pack
+        records = []
+        for symbol, price in prices.items():
+            encoded = symbol.encode()
+            if len(encoded) > SYMBOL_SIZE:  # struct would silently truncate it to another symbol
+                if symbol not in self._skipped:
+                    self._skipped.add(symbol)
+                    print(f"Tick recorder: {symbol} is longer than {SYMBOL_SIZE} bytes, not recorded")
+                continue
+            records.append(pack(timestamp, price, encoded))
+        self._file.write(b''.join(records))
+        self.count += len(records)
+        if time.monotonic() - self._last_flush > FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self) -> None:
+        """Hand buffered records to the OS"""
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """Flush and close the file"""
+        if not self._file.closed:
+            self._file.close()
+
+
+class TickReader:
+    """Random access to a recording through a read-only memory map"""
+
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a tick recording")
+            size = os.fstat(f.fileno()).st_size
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size > len(MAGIC) else b''
+        self.count = max(0, size - len(MAGIC)) // RECORD.size  # A torn last record is ignored
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> Tuple[float, str, float]:
+        """Return (timestamp, symbol, price) of record index"""
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        timestamp, price, symbol = RECORD.unpack_from(self._map, len(MAGIC) + index * RECORD.size)
+        return timestamp, symbol.rstrip(b'\0').decode(), price
+
+    def time_at(self, index: int) -> float:
+        """Return the timestamp of record index without decoding the rest"""
+        return struct.unpack_from('<d', self._map, len(MAGIC) + index * RECORD.size)[0]
+
+    def records(self, start: int = 0) -> Iterator[Tuple[float, str, float]]:
+        """Yield records from start"""
+        for index in range(start, self.count):
+            yield self[index]
+
+    def symbols(self) -> List[str]:
+        """Return recorded symbols in order of first appearance"""
+        seen = {}
+        for _, symbol, _ in self.records():
+            seen.setdefault(symbol, None)
+        return list(seen)
+
+    def span(self) -> Optional[Tuple[float, float]]:
+        """Return (first, last) timestamp"""
+        if not self.count:
+            return None
+        return self.time_at(0), self.time_at(self.count - 1)
+
+    def close(self) -> None:
+        """Release the memory map"""
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+
+def main(argv: List[str]) -> None:
+    """Print a summary of a recording
+
+    Usage: python tick_recorder.py ticks.bin
+    """
+    if not argv:
+        print(main.__doc__)
+        return
+    reader = TickReader(argv[0])
+    span = reader.span()
+    print(f"{len(reader)} records, {len(reader.symbols())} symbols")
+    if span:
+        print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(span[0]))} - "
+              f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(span[1]))} ({span[1] - span[0]:.0f} s)")
+    reader.close()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
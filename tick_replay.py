@@ -0,0 +1,59 @@
+import time
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from tick_recorder import TickReader
+
+# Constants
+REPLAY_INTERVAL = 50  # ms between replay steps
+MAX_STEP_RECORDS = 5000  # Records per step when replaying unpaced (speed 0)
+
+
+class TickReplay(QObject):
+    """Plays a recording back on the GUI thread at a multiple of real time"""
+
+    prices_ready = pyqtSignal(dict, float)  # symbol -> price, recorded time of the batch
+    finished = pyqtSignal()
+
+    def __init__(self, reader: TickReader, speed: float = 1.0, parent=None) -> None:
+        super().__init__(parent)
+        self.reader = reader
+        self.speed = speed  # 1 = real time, 10 = ten times faster, 0 = as fast as possible
+        self.position = 0
+        self._started = 0.0
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._step)
+
+    def start(self) -> None:
+        """Start from the first record"""
+        self.position = 0
+        self._started = time.monotonic()
+        self._timer.start(REPLAY_INTERVAL if self.speed > 0 else 0)
+
+    def stop(self) -> None:
+        """Stop playback"""
+        self._timer.stop()
+
+    def _step(self) -> None:
+        """Emit every record that is due, merged into one batch"""
+        reader = self.reader
+        if self.position >= len(reader):
+            self.stop()
+            self.finished.emit()
+            return
+        if self.speed > 0:
+            # Scan forward instead of bisecting: an older recording may not be in time order,
+            # and an out-of-order record is simply due with its predecessor
+            session_time = reader.time_at(0) + (time.monotonic() - self._started) * self.speed
+            end = self.position
+            while end < len(reader) and reader.time_at(end) <= session_time:
+                end += 1
+        else:
+            end = min(len(reader), self.position + MAX_STEP_RECORDS)
+        if end <= self.position:
+            return
+
+        prices = {}
+        for index in range(self.position, end):
+            timestamp, symbol, price = reader[index]
+            prices[symbol] = price  # Latest price per symbol wins
+        self.position = end
+        self.prices_ready.emit(prices, timestamp)